@@ -2,6 +2,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.server_api import ServerApi
 import os
 from dotenv import load_dotenv
+from app.config.indexes import ensure_indexes
 
 load_dotenv()
 
@@ -13,11 +14,16 @@ database = None
 
 
 async def connect_to_mongo():
-    """Connect to MongoDB"""
+    """Connect to MongoDB and apply the declared indexes"""
     global client, database
     client = AsyncIOMotorClient(MONGODB_URL, server_api=ServerApi('1'))
     database = client[DATABASE_NAME]
     print(f"Connected to MongoDB at {MONGODB_URL}")
+    
+    summary = await ensure_indexes(database)
+    print(f"Ensured {len(summary['created'])} indexes")
+    for index_name, error in summary["errors"].items():
+        print(f"Failed to create index {index_name}: {error}")
 
 
 async def close_mongo_connection():
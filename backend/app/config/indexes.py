@@ -0,0 +1,163 @@
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import PyMongoError, ConnectionFailure
+
+# Declared indexes for every collection, applied idempotently on startup.
+# Names are explicit so the live indexes can be compared against this spec.
+INDEX_SPEC = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("role", ASCENDING), ("is_verified", ASCENDING)], name="role_is_verified"),
+    ],
+    "papers": [
+        # _id breaks created_at ties for keyset pagination
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [
+                ("college", ASCENDING),
+                ("course", ASCENDING),
+                ("subject", ASCENDING),
+                ("year", ASCENDING),
+                ("exam_type", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="browse_filters_created_at_id"
+        ),
+        IndexModel([("subject", ASCENDING), ("created_at", DESCENDING)], name="subject_created_at"),
+        IndexModel([("faculty_id", ASCENDING), ("created_at", DESCENDING)], name="faculty_id_created_at"),
+    ],
+    "questions": [
+        IndexModel([("paper_id", ASCENDING), ("question_number", ASCENDING)], name="paper_id_question_number"),
+        IndexModel(
+            [("question_text", TEXT), ("subject", TEXT), ("tags", TEXT)],
+            name="question_text_search",
+            weights={"question_text": 10, "tags": 5, "subject": 2},
+            default_language="english"
+        ),
+    ],
+    "question_signatures": [
+        # Multikey index on LSH band keys: near-duplicate lookup is sub-linear
+        IndexModel([("bands", ASCENDING)], name="bands"),
+        IndexModel([("cluster_id", ASCENDING)], name="cluster_id"),
+        IndexModel([("paper_id", ASCENDING)], name="paper_id"),
+    ],
+    "question_reports": [
+        # Moderation queue: filter by status, newest first, keyset on _id
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id"
+        ),
+        IndexModel(
+            [("question_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="question_id_created_at_id"
+        ),
+    ],
+    "saved_items": [
+        IndexModel(
+            [("user_id", ASCENDING), ("item_type", ASCENDING), ("item_id", ASCENDING)],
+            name="user_id_item_type_item_id_unique",
+            unique=True
+        ),
+        # Saved lists: newest saves first, keyset on _id
+        IndexModel(
+            [("user_id", ASCENDING), ("item_type", ASCENDING), ("saved_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_item_type_saved_at_id"
+        ),
+    ],
+    "jobs": [
+        IndexModel([("status", ASCENDING), ("run_after", ASCENDING)], name="status_run_after"),
+        IndexModel(
+            [("type", ASCENDING), ("paper_id", ASCENDING), ("created_at", DESCENDING)],
+            name="type_paper_id_created_at"
+        ),
+    ],
+    "generation_leases": [
+        # Safety net: expired leases are also taken over in code
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+# Index options that must match for a live index to count as up to date
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "weights")
+
+
+def _spec_document(model: IndexModel) -> dict:
+    document = dict(model.document)
+    # Field order matters for compound indexes, so keys compare as ordered lists
+    document["key"] = list(document["key"].items())
+    return document
+
+
+async def ensure_indexes(db) -> dict:
+    """
+    Create every index in INDEX_SPEC (a no-op for indexes that already exist)
+
+    Failures are reported per collection instead of aborting startup, e.g.
+    a unique index that cannot be built because of existing duplicates.
+    """
+    summary = {"created": [], "errors": {}}
+    for collection_name, models in INDEX_SPEC.items():
+        for model in models:
+            try:
+                await db[collection_name].create_indexes([model])
+                summary["created"].append(f"{collection_name}.{model.document['name']}")
+            except ConnectionFailure as e:
+                # The server is unreachable; don't wait out a timeout per index
+                summary["errors"]["connection"] = str(e)
+                return summary
+            except PyMongoError as e:
+                summary["errors"][f"{collection_name}.{model.document['name']}"] = str(e)
+    return summary
+
+
+async def get_index_report(db) -> dict:
+    """Compare live indexes with INDEX_SPEC for every declared collection"""
+    report = {}
+    for collection_name, models in INDEX_SPEC.items():
+        live = {}
+        async for index in db[collection_name].list_indexes():
+            live[index["name"]] = index
+
+        missing, mismatched, ok = [], [], []
+        for model in models:
+            spec = _spec_document(model)
+            index = live.get(spec["name"])
+            if index is None:
+                missing.append(spec["name"])
+                continue
+
+            differences = {}
+            live_key = list(index["key"].items())
+            if "_fts" in dict(live_key):
+                # Text indexes store their fields in weights, not in key, and
+                # their field order does not matter
+                live_key = [(field, TEXT) for field in index.get("weights", {})]
+                matches = sorted(live_key) == sorted(spec["key"])
+            else:
+                matches = live_key == spec["key"]
+            if not matches:
+                differences["key"] = {"expected": spec["key"], "actual": live_key}
+            for option in _COMPARED_OPTIONS:
+                expected, actual = spec.get(option), index.get(option)
+                if option == "weights" and expected is None:
+                    continue  # Text indexes without explicit weights get defaults
+                if actual != expected:
+                    differences[option] = {"expected": expected, "actual": actual}
+
+            if differences:
+                mismatched.append({"name": spec["name"], "differences": differences})
+            else:
+                ok.append(spec["name"])
+
+        declared = {model.document["name"] for model in models}
+        extra = [name for name in live if name != "_id_" and name not in declared]
+
+        report[collection_name] = {
+            "ok": ok,
+            "missing": missing,
+            "mismatched": mismatched,
+            "extra": extra,
+            "in_sync": not missing and not mismatched
+        }
+    return report
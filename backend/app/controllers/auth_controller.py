@@ -3,6 +3,9 @@ from app.config.database import get_database
 from app.models.user import UserRegister, UserLogin, UserResponse, UserInDB
 from app.utils.jwt import create_access_token
 from datetime import datetime
+from pymongo.errors import DuplicateKeyError
+from app.utils.password_hashing import run_password_work
+from app.utils.stats_rollup import record_stats
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -32,12 +35,15 @@ async def register_user(user_data: UserRegister):
     if existing_username:
         return {"success": False, "message": "Username already taken"}
     
+    # bcrypt runs on the bounded password executor, not the event loop
+    hashed_password = await run_password_work(hash_password, user_data.password)
+    
     # Create user document
     user_dict = {
         "email": user_data.email,
         "username": user_data.username,
         "role": user_data.role,
-        "hashed_password": hash_password(user_data.password),
+        "hashed_password": hashed_password,
         "created_at": datetime.utcnow(),
         "is_verified": True if user_data.role == "student" else False  # Faculty needs verification
     }
@@ -53,8 +59,14 @@ async def register_user(user_data: UserRegister):
         user_dict["department"] = user_data.department
         user_dict["faculty_id"] = user_data.faculty_id
     
-    # Insert user
-    result = await users_collection.insert_one(user_dict)
+    # Insert user (unique indexes catch a concurrent registration with the same email/username)
+    try:
+        result = await users_collection.insert_one(user_dict)
+    except DuplicateKeyError as e:
+        if "username" in (e.details or {}).get("keyPattern", {}):
+            return {"success": False, "message": "Username already taken"}
+        return {"success": False, "message": "Email already registered"}
+    await record_stats({"signups": 1}, {"users": 1})
     
     # Create JWT token
     access_token = create_access_token(
@@ -103,7 +115,7 @@ async def login_user(user_data: UserLogin):
         return {"success": False, "message": "Invalid email or password"}
     
     # Verify password
-    if not verify_password(user_data.password, user["hashed_password"]):
+    if not await run_password_work(verify_password, user_data.password, user["hashed_password"]):
         return {"success": False, "message": "Invalid email or password"}
     
     # Create JWT token
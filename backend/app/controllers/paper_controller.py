@@ -1,3 +1,6 @@
+import os
+import json
+import asyncio
 from app.config.database import get_database
 from app.models.paper import PaperCreate, PaperUpdate
 from datetime import datetime
@@ -6,6 +9,28 @@ from fastapi import UploadFile
 from typing import Optional
 from app.utils.file_storage import upload_paper_pdf, delete_file
 from app.utils.ocr_extractor import process_paper_pdf
+from app.utils.job_queue import enqueue_job, get_latest_job, serialize_job, update_job_progress
+from app.utils.gemini_ai import is_gemini_configured
+from app.utils.ttl_cache import TTLCache
+from app.utils.near_duplicates import link_near_duplicates, delete_paper_signatures
+from app.utils.paper_facets import FACET_FIELDS, facet_key, increment_paper_facets, get_paper_facets, normalize_year
+from app.utils.write_behind import paper_views
+from app.utils.pagination import encode_cursor, keyset_query
+from app.utils.projection import paper_list_projection
+from app.utils.stats_rollup import record_stats
+from app.controllers.question_controller import (
+    build_question_document,
+    apply_cached_solutions,
+    generate_ai_solution
+)
+
+PAPER_INGESTION_JOB = "paper_ingestion"
+PAPER_AI_SOLUTIONS_JOB = "paper_ai_solutions"
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", 4))
+PAPER_COUNT_CACHE_TTL = int(os.getenv("PAPER_COUNT_CACHE_TTL", 60))
+
+# Estimated totals per filter combination
+_paper_count_cache = TTLCache(maxsize=1024, ttl=PAPER_COUNT_CACHE_TTL)
 
 
 async def create_paper(paper_data: PaperCreate, faculty_name: str):
@@ -18,7 +43,7 @@ async def create_paper(paper_data: PaperCreate, faculty_name: str):
         "college": paper_data.college,
         "course": paper_data.course,
         "semester": paper_data.semester,
-        "year": paper_data.year,
+        "year": normalize_year(paper_data.year),
         "exam_type": paper_data.exam_type,
         "pdf_url": paper_data.pdf_url,
         "faculty_id": paper_data.faculty_id,
@@ -32,16 +57,70 @@ async def create_paper(paper_data: PaperCreate, faculty_name: str):
     }
     
     result = await papers_collection.insert_one(paper_dict)
+    await increment_paper_facets(paper_dict)
+    await record_stats({"uploads": 1}, {"papers": 1})
     
     paper_dict["id"] = str(result.inserted_id)
+    paper_dict.pop("_id", None)
     return {"success": True, "message": "Paper created successfully", "paper": paper_dict}
 
 
-async def get_all_papers(filters: dict = None, skip: int = 0, limit: int = 20):
-    """Get all papers with optional filters"""
+async def get_paper_browse_facets(filters: dict = None):
+    """Get facet counts (colleges, courses, subjects, years, exam types) for the paper browser"""
+    try:
+        facets = await get_paper_facets(filters)
+        return {"success": True, "facets": facets}
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+
+async def count_papers(query: dict, mode: str):
+    """Count papers matching a query: exact, estimated (cached) or none"""
     db = get_database()
     papers_collection = db.papers
     
+    if mode == "none":
+        return None
+    if mode == "exact":
+        return await papers_collection.count_documents(query)
+    
+    cache_key = json.dumps(query, sort_keys=True, default=str)
+    total = _paper_count_cache.get(cache_key)
+    if total is None:
+        if query:
+            total = await papers_collection.count_documents(query)
+        else:
+            total = await papers_collection.estimated_document_count()
+        _paper_count_cache.set(cache_key, total)
+    return total
+
+
+async def get_all_papers(
+    filters: dict = None,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    count: Optional[str] = None,
+    view: str = "summary",
+    fields: Optional[str] = None
+):
+    """
+    Get all papers with optional filters
+    
+    Pages either by skip/limit or, when a cursor is given, by keyset on
+    (created_at, _id) so every page costs the same. count is "exact",
+    "estimated" (cached) or "none"; it defaults to exact for skip/limit
+    pages and estimated for cursor pages. Rows are compact summaries unless
+    view=full or fields= is given.
+    """
+    db = get_database()
+    papers_collection = db.papers
+    
+    try:
+        projection = paper_list_projection(view, fields)
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    
     query = {}
     if filters:
         if filters.get("college"):
@@ -57,16 +136,40 @@ async def get_all_papers(filters: dict = None, skip: int = 0, limit: int = 20):
         if filters.get("has_faculty_solution") is not None:
             query["has_faculty_solution"] = filters["has_faculty_solution"]
     
-    cursor = papers_collection.find(query).skip(skip).limit(limit).sort("created_at", -1)
-    papers = []
+    page_query = query
+    if cursor:
+        try:
+            page_query = keyset_query(query, cursor)
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+        skip = 0
     
-    async for paper in cursor:
+    find_cursor = papers_collection.find(page_query, projection).sort([("created_at", -1), ("_id", -1)])
+    if skip:
+        find_cursor = find_cursor.skip(skip)
+    find_cursor = find_cursor.limit(limit)
+    
+    papers = []
+    next_cursor = None
+    async for paper in find_cursor:
+        next_cursor = encode_cursor(paper)
         paper["id"] = str(paper.pop("_id"))
         papers.append(paper)
     
-    total = await papers_collection.count_documents(query)
+    # A short page is the last one
+    if len(papers) < limit:
+        next_cursor = None
+    
+    total = await count_papers(query, count or ("estimated" if cursor else "exact"))
     
-    return {"success": True, "papers": papers, "total": total, "skip": skip, "limit": limit}
+    return {
+        "success": True,
+        "papers": papers,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor
+    }
 
 
 async def get_paper_by_id(paper_id: str):
@@ -79,11 +182,9 @@ async def get_paper_by_id(paper_id: str):
         if not paper:
             return {"success": False, "message": "Paper not found"}
         
-        # Increment views
-        await papers_collection.update_one(
-            {"_id": ObjectId(paper_id)},
-            {"$inc": {"views": 1}}
-        )
+        # Views are buffered and written in bulk by the write-behind flusher
+        paper_views.increment(paper_id)
+        paper["views"] = paper.get("views", 0) + paper_views.pending(paper_id)
         
         paper["id"] = str(paper.pop("_id"))
         return {"success": True, "paper": paper}
@@ -100,14 +201,21 @@ async def update_paper(paper_id: str, update_data: PaperUpdate):
     update_dict["updated_at"] = datetime.utcnow()
     
     try:
-        result = await papers_collection.update_one(
+        previous = await papers_collection.find_one_and_update(
             {"_id": ObjectId(paper_id)},
-            {"$set": update_dict}
+            {"$set": update_dict},
+            projection={field: 1 for field in FACET_FIELDS}
         )
         
-        if result.modified_count == 0:
+        if previous is None:
             return {"success": False, "message": "Paper not found or not modified"}
         
+        # Move the paper to its new facet combination if a facet field changed
+        updated = {**previous, **update_dict}
+        if facet_key(updated) != facet_key(previous):
+            await increment_paper_facets(previous, -1)
+            await increment_paper_facets(updated, 1)
+        
         return {"success": True, "message": "Paper updated successfully"}
     except Exception as e:
         return {"success": False, "message": str(e)}
@@ -121,25 +229,38 @@ async def delete_paper(paper_id: str):
     
     try:
         # Delete associated questions
-        await questions_collection.delete_many({"paper_id": paper_id})
+        removed = await questions_collection.delete_many({"paper_id": paper_id})
+        await record_stats(totals={"questions": -removed.deleted_count})
+        await delete_paper_signatures(paper_id)
         
         # Delete paper
-        result = await papers_collection.delete_one({"_id": ObjectId(paper_id)})
+        deleted = await papers_collection.find_one_and_delete(
+            {"_id": ObjectId(paper_id)},
+            projection={field: 1 for field in FACET_FIELDS}
+        )
         
-        if result.deleted_count == 0:
+        if deleted is None:
             return {"success": False, "message": "Paper not found"}
         
+        await increment_paper_facets(deleted, -1)
+        await record_stats(totals={"papers": -1})
+        
         return {"success": True, "message": "Paper deleted successfully"}
     except Exception as e:
         return {"success": False, "message": str(e)}
 
 
-async def get_faculty_papers(faculty_id: str):
+async def get_faculty_papers(faculty_id: str, view: str = "summary", fields: str = None):
     """Get all papers uploaded by a faculty"""
     db = get_database()
     papers_collection = db.papers
     
-    cursor = papers_collection.find({"faculty_id": faculty_id}).sort("created_at", -1)
+    try:
+        projection = paper_list_projection(view, fields)
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    
+    cursor = papers_collection.find({"faculty_id": faculty_id}, projection).sort("created_at", -1)
     papers = []
     
     async for paper in cursor:
@@ -161,10 +282,9 @@ async def upload_paper_with_pdf(
     faculty_name: str,
     extract_questions: bool = True
 ):
-    """Upload paper PDF and optionally extract questions using OCR"""
+    """Upload paper PDF and optionally queue question extraction"""
     db = get_database()
     papers_collection = db.papers
-    questions_collection = db.questions
     
     try:
         # Upload the PDF file
@@ -179,7 +299,7 @@ async def upload_paper_with_pdf(
             "college": college,
             "course": course,
             "semester": semester,
-            "year": year,
+            "year": normalize_year(year),
             "exam_type": exam_type,
             "pdf_url": upload_result["file_url"],
             "faculty_id": faculty_id,
@@ -194,44 +314,26 @@ async def upload_paper_with_pdf(
         
         # Insert paper
         result = await papers_collection.insert_one(paper_dict)
+        await increment_paper_facets(paper_dict)
+        await record_stats({"uploads": 1}, {"papers": 1})
         paper_id = str(result.inserted_id)
         paper_dict["id"] = paper_id
+        paper_dict.pop("_id", None)
         
-        # Extract questions if requested
-        questions_created = 0
+        # Queue question extraction; the OCR pass runs in the job worker pool
+        ingestion = None
         if extract_questions:
-            ocr_result = await process_paper_pdf(upload_result["file_path"])
-            
-            if ocr_result["success"] and ocr_result["questions"]:
-                # Create question documents
-                for q in ocr_result["questions"]:
-                    question_dict = {
-                        "paper_id": paper_id,
-                        "question_number": q["question_number"],
-                        "question_text": q["question_text"],
-                        "marks": q.get("marks"),
-                        "has_ai_solution": False,
-                        "ai_solution": None,
-                        "has_video_solution": False,
-                        "video_url": None,
-                        "views": 0,
-                        "created_at": datetime.utcnow()
-                    }
-                    await questions_collection.insert_one(question_dict)
-                    questions_created += 1
-                
-                # Update paper with question count
-                await papers_collection.update_one(
-                    {"_id": ObjectId(paper_id)},
-                    {"$set": {"question_count": questions_created}}
-                )
-                paper_dict["question_count"] = questions_created
+            job = await enqueue_job(
+                PAPER_INGESTION_JOB,
+                {"paper_id": paper_id, "file_path": upload_result["file_path"]}
+            )
+            ingestion = serialize_job(job)
         
         return {
             "success": True,
             "message": "Paper uploaded successfully",
             "paper": paper_dict,
-            "questions_extracted": questions_created,
+            "ingestion": ingestion,
             "file_info": {
                 "filename": upload_result["filename"],
                 "size": upload_result["file_size"]
@@ -241,6 +343,84 @@ async def upload_paper_with_pdf(
         return {"success": False, "message": f"Upload failed: {str(e)}"}
 
 
+async def ingest_paper_questions(job: dict):
+    """Job handler: extract questions from an uploaded paper PDF and store them"""
+    db = get_database()
+    papers_collection = db.papers
+    questions_collection = db.questions
+    
+    paper_id = job["payload"]["paper_id"]
+    paper = await papers_collection.find_one(
+        {"_id": ObjectId(paper_id)},
+        {"subject": 1, "year": 1, "exam_type": 1}
+    )
+    if not paper:
+        # Paper was deleted before its job ran; nothing to do
+        return {"success": True, "questions_extracted": 0, "skipped": "paper deleted"}
+    
+    ocr_result = await process_paper_pdf(job["payload"]["file_path"])
+    if not ocr_result["success"]:
+        return {"success": False, "message": ocr_result.get("error", "Extraction failed")}
+    
+    # Drop questions left behind by an earlier, interrupted attempt
+    leftovers = await questions_collection.delete_many({"paper_id": paper_id, "source": "ocr"})
+    await delete_paper_signatures(paper_id)
+    
+    question_docs = [
+        build_question_document(
+            q["question_number"],
+            q["question_text"],
+            paper_id,
+            paper.get("subject"),
+            marks=q.get("marks"),
+            source="ocr"
+        )
+        for q in ocr_result["questions"]
+    ]
+    
+    questions_created = 0
+    solutions_reused = 0
+    duplicates_linked = 0
+    if question_docs:
+        solutions_reused = await apply_cached_solutions(question_docs)
+        result = await questions_collection.insert_many(question_docs, ordered=False)
+        questions_created = len(result.inserted_ids)
+        
+        # Link repeats of questions from earlier papers ("also asked in ...")
+        try:
+            duplicates_linked = await link_near_duplicates(question_docs, paper)
+        except Exception as e:
+            print(f"Near-duplicate linking failed for paper {paper_id}: {e}")
+    
+    await record_stats(
+        {"questions_extracted": questions_created},
+        {"questions": questions_created - leftovers.deleted_count}
+    )
+    
+    # Update paper with question count
+    await papers_collection.update_one(
+        {"_id": ObjectId(paper_id)},
+        {"$set": {"question_count": questions_created, "updated_at": datetime.utcnow()}}
+    )
+    
+    return {
+        "success": True,
+        "questions_extracted": questions_created,
+        "ai_solutions_reused": solutions_reused,
+        "near_duplicates_linked": duplicates_linked,
+        "metadata": ocr_result.get("metadata", {})
+    }
+
+
+async def get_paper_ingestion_status(paper_id: str):
+    """Get the status of the latest question-extraction job for a paper"""
+    job = await get_latest_job(PAPER_INGESTION_JOB, paper_id)
+    if not job:
+        return {"success": False, "message": "No ingestion job found for this paper"}
+    
+    return {"success": True, "ingestion": serialize_job(job)}
+
+
 async def update_paper_solution(paper_id: str, file: UploadFile):
     """Upload faculty solution for a paper"""
     from app.utils.file_storage import upload_solution_file
@@ -278,3 +458,84 @@ async def update_paper_solution(paper_id: str, file: UploadFile):
     except Exception as e:
         return {"success": False, "message": f"Upload failed: {str(e)}"}
 
+
+async def queue_paper_ai_solutions(paper_id: str):
+    """Queue generation of missing AI solutions for every question of a paper"""
+    db = get_database()
+    papers_collection = db.papers
+    
+    if not is_gemini_configured():
+        return {
+            "success": False,
+            "message": "AI service not configured. Please set GEMINI_API_KEY in .env file"
+        }
+    
+    try:
+        paper = await papers_collection.find_one({"_id": ObjectId(paper_id)}, {"_id": 1})
+        if not paper:
+            return {"success": False, "message": "Paper not found"}
+        
+        # Reuse a batch that is already waiting or running for this paper
+        job = await get_latest_job(PAPER_AI_SOLUTIONS_JOB, paper_id)
+        if job and job["status"] in ("queued", "running"):
+            return {"success": True, "message": "AI solution batch already in progress", "batch": serialize_job(job)}
+        
+        job = await enqueue_job(PAPER_AI_SOLUTIONS_JOB, {"paper_id": paper_id})
+        return {"success": True, "message": "AI solution batch queued", "batch": serialize_job(job)}
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+
+async def generate_paper_ai_solutions(job: dict):
+    """Job handler: generate missing AI solutions for a paper with bounded concurrency"""
+    db = get_database()
+    questions_collection = db.questions
+    
+    paper_id = job["payload"]["paper_id"]
+    total = await questions_collection.count_documents({"paper_id": paper_id})
+    cursor = questions_collection.find(
+        {"paper_id": paper_id, "ai_solution.text": {"$exists": False}},
+        {"_id": 1}
+    )
+    pending = [str(q["_id"]) async for q in cursor]
+    
+    progress = {
+        "total": total,
+        "skipped": total - len(pending),
+        "generated": 0,
+        "failed": 0,
+        "failed_question_ids": [],
+        "errors": []
+    }
+    await update_job_progress(job["_id"], progress)
+    
+    semaphore = asyncio.Semaphore(AI_BATCH_CONCURRENCY)
+    
+    async def solve(question_id: str):
+        async with semaphore:
+            result = await generate_ai_solution(question_id)
+        if not result["success"]:
+            progress["failed"] += 1
+            progress["failed_question_ids"].append(question_id)
+            progress["errors"] = (progress["errors"] + [{"question_id": question_id, "message": result["message"]}])[-10:]
+        elif result.get("cached"):
+            progress["skipped"] += 1
+        else:
+            progress["generated"] += 1
+        await update_job_progress(job["_id"], progress)
+    
+    await asyncio.gather(*(solve(question_id) for question_id in pending))
+    
+    # Per-question failures are recorded, not retried as a whole batch: one question
+    # that keeps failing would otherwise re-run the job JOB_MAX_ATTEMPTS times.
+    # Queueing the batch again later picks up only the questions still unsolved.
+    return {"success": True, **progress}
+
+
+async def get_paper_ai_solutions_status(paper_id: str):
+    """Get progress of the latest AI solution batch for a paper"""
+    job = await get_latest_job(PAPER_AI_SOLUTIONS_JOB, paper_id)
+    if not job:
+        return {"success": False, "message": "No AI solution batch found for this paper"}
+    
+    return {"success": True, "batch": serialize_job(job)}
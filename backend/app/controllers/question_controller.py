@@ -1,32 +1,83 @@
+import os
+import asyncio
 from app.config.database import get_database
 from app.models.question import QuestionCreate, ReportIssue
 from datetime import datetime
 from bson import ObjectId
-from app.utils.gemini_ai import generate_ai_solution as gemini_generate, is_gemini_configured
+from collections import Counter
+from typing import AsyncIterator, List
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.utils.gemini_ai import (
+    generate_ai_solution as gemini_generate,
+    stream_ai_solution as gemini_stream,
+    is_gemini_configured,
+    GEMINI_MODEL
+)
+from app.utils.serialization import dumps
 from app.utils.youtube_search import search_videos_for_question, is_youtube_configured
+from app.utils.text_search import build_snippet
+from app.utils.near_duplicates import get_also_asked_in
+from app.utils.projection import question_list_projection
+from app.utils.write_behind import question_views, question_votes, VOTE_VALUES
+from app.utils.stats_rollup import record_stats
+from app.utils.singleflight import singleflight, acquire_lease, release_lease, is_lease_held
+from app.utils.solution_cache import (
+    solution_cache_key,
+    get_cached_solution,
+    get_cached_solutions,
+    store_cached_solution,
+    record_ingestion_fills
+)
 
+AI_SOLUTION_LEASE_SECONDS = int(os.getenv("AI_SOLUTION_LEASE_SECONDS", 120))
+AI_SOLUTION_POLL_INTERVAL = 0.5
+SEARCH_TEXT_PREVIEW = 500
 
-async def create_question(question_data: QuestionCreate):
-    """Create a new question"""
-    db = get_database()
-    questions_collection = db.questions
-    
-    question_dict = {
-        "question_number": question_data.question_number,
-        "question_text": question_data.question_text,
-        "paper_id": question_data.paper_id,
-        "subject": question_data.subject,
+
+def build_question_document(
+    question_number: int,
+    question_text: str,
+    paper_id: str,
+    subject: str = None,
+    marks: int = None,
+    source: str = "manual"
+) -> dict:
+    """Build a new question document with default solution and voting fields"""
+    return {
+        "question_number": question_number,
+        "question_text": question_text,
+        "paper_id": paper_id,
+        "subject": subject,
+        "marks": marks,
+        "source": source,
         "faculty_solution": None,
         "ai_solution": None,
+        "has_ai_solution": False,
         "video_links": [],
+        "has_video_solution": False,
         "tags": [],
         "upvotes": 0,
         "downvotes": 0,
-        "reports": [],
+        "views": 0,
         "created_at": datetime.utcnow()
     }
+
+
+async def create_question(question_data: QuestionCreate):
+    """Create a new question"""
+    db = get_database()
+    questions_collection = db.questions
+    
+    question_dict = build_question_document(
+        question_data.question_number,
+        question_data.question_text,
+        question_data.paper_id,
+        question_data.subject
+    )
     
     result = await questions_collection.insert_one(question_dict)
+    await record_stats(totals={"questions": 1})
     
     # Update paper question count
     papers_collection = db.papers
@@ -36,34 +87,171 @@ async def create_question(question_data: QuestionCreate):
     )
     
     question_dict["id"] = str(result.inserted_id)
+    question_dict.pop("_id", None)
     return {"success": True, "message": "Question created successfully", "question": question_dict}
 
 
-async def get_questions_by_paper(paper_id: str):
-    """Get all questions for a paper"""
+async def create_questions_bulk(questions: List[QuestionCreate]):
+    """Create many questions with one insert and one count update per paper"""
     db = get_database()
     questions_collection = db.questions
+    papers_collection = db.papers
     
-    cursor = questions_collection.find({"paper_id": paper_id}).sort("question_number", 1)
+    try:
+        question_docs = [
+            build_question_document(q.question_number, q.question_text, q.paper_id, q.subject)
+            for q in questions
+        ]
+        await apply_cached_solutions(question_docs)
+        
+        try:
+            result = await questions_collection.insert_many(question_docs, ordered=False)
+            inserted_ids = result.inserted_ids
+        except BulkWriteError as e:
+            # Unordered inserts keep going past failures; count what landed
+            failed = {err["index"] for err in e.details.get("writeErrors", [])}
+            inserted_ids = [doc["_id"] for i, doc in enumerate(question_docs) if i not in failed]
+        
+        inserted = set(inserted_ids)
+        await record_stats(totals={"questions": len(inserted)})
+        per_paper = Counter(doc["paper_id"] for doc in question_docs if doc["_id"] in inserted)
+        if per_paper:
+            await papers_collection.bulk_write(
+                [
+                    UpdateOne({"_id": ObjectId(paper_id)}, {"$inc": {"question_count": count}})
+                    for paper_id, count in per_paper.items()
+                ],
+                ordered=False
+            )
+        
+        created = []
+        for doc in question_docs:
+            if doc["_id"] in inserted:
+                doc["id"] = str(doc.pop("_id"))
+                created.append(doc)
+        
+        return {
+            "success": True,
+            "message": f"{len(created)} questions created successfully",
+            "questions": created,
+            "total": len(created),
+            "failed": len(question_docs) - len(created)
+        }
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+
+async def get_questions_by_paper(paper_id: str, view: str = "summary", fields: str = None):
+    """Get all questions for a paper (compact summaries unless view=full or fields= is given)"""
+    db = get_database()
+    questions_collection = db.questions
+    
+    try:
+        projection = question_list_projection(view, fields)
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    
+    cursor = questions_collection.aggregate([
+        {"$match": {"paper_id": paper_id}},
+        {"$sort": {"question_number": 1}},
+        {"$project": projection}
+    ])
     questions = []
     
     async for question in cursor:
         question["id"] = str(question.pop("_id"))
+        if "upvotes" in question or "downvotes" in question:
+            question_votes.apply_pending(question, question["id"])
         questions.append(question)
     
     return {"success": True, "questions": questions, "total": len(questions)}
 
 
+async def search_questions(query: str, subject: str = None, skip: int = 0, limit: int = 20):
+    """Full-text search over question text, subject and tags, ranked by relevance"""
+    db = get_database()
+    questions_collection = db.questions
+    papers_collection = db.papers
+    
+    text_query = {"$text": {"$search": query}}
+    if subject:
+        text_query["subject"] = subject
+    
+    try:
+        # Fetch one extra row to know whether another page exists without counting
+        cursor = questions_collection.find(
+            text_query,
+            {
+                "score": {"$meta": "textScore"},
+                "question_number": 1,
+                "question_text": 1,
+                "paper_id": 1,
+                "subject": 1,
+                "tags": 1,
+                "marks": 1,
+                "has_ai_solution": 1
+            }
+        ).sort([("score", {"$meta": "textScore"})]).skip(skip).limit(limit + 1)
+        
+        results = []
+        async for question in cursor:
+            question["id"] = str(question.pop("_id"))
+            question["snippet"] = build_snippet(question.get("question_text", ""), query)
+            question["question_text"] = question.get("question_text", "")[:SEARCH_TEXT_PREVIEW]
+            results.append(question)
+        
+        has_more = len(results) > limit
+        results = results[:limit]
+        
+        # Attach paper details (year, college, exam type) with one lookup
+        paper_ids = list({ObjectId(q["paper_id"]) for q in results if ObjectId.is_valid(q.get("paper_id"))})
+        papers = {}
+        if paper_ids:
+            paper_cursor = papers_collection.find(
+                {"_id": {"$in": paper_ids}},
+                {"college": 1, "course": 1, "year": 1, "exam_type": 1, "subject": 1}
+            )
+            async for paper in paper_cursor:
+                papers[str(paper.pop("_id"))] = paper
+        for question in results:
+            question["paper"] = papers.get(question.get("paper_id"))
+        
+        return {
+            "success": True,
+            "questions": results,
+            "query": query,
+            "skip": skip,
+            "limit": limit,
+            "has_more": has_more
+        }
+    except Exception as e:
+        return {"success": False, "message": f"Search failed: {str(e)}"}
+
+
 async def get_question_by_id(question_id: str):
     """Get a single question by ID"""
     db = get_database()
     questions_collection = db.questions
     
     try:
-        question = await questions_collection.find_one({"_id": ObjectId(question_id)})
+        question = await questions_collection.find_one({"_id": ObjectId(question_id)}, {"reports": 0})
         if not question:
             return {"success": False, "message": "Question not found"}
         
+        # Near-duplicates of this question in other papers
+        question["also_asked_in"] = []
+        if question.get("duplicate_cluster_id") or question.get("source") == "ocr":
+            question["also_asked_in"] = await get_also_asked_in(
+                question["_id"],
+                question.get("duplicate_cluster_id", question["_id"])
+            )
+        question.pop("duplicate_cluster_id", None)
+        
+        # Views are buffered and written in bulk by the write-behind flusher
+        question_views.increment(question_id)
+        question["views"] = question.get("views", 0) + question_views.pending(question_id)
+        question_votes.apply_pending(question, question_id)
+        
         question["id"] = str(question.pop("_id"))
         return {"success": True, "question": question}
     except Exception as e:
@@ -74,7 +262,6 @@ async def generate_ai_solution(question_id: str):
     """Generate AI solution for a question using Gemini"""
     db = get_database()
     questions_collection = db.questions
-    papers_collection = db.papers
     
     try:
         # Check if Gemini is configured
@@ -98,18 +285,136 @@ async def generate_ai_solution(question_id: str):
                 "cached": True
             }
         
-        # Get paper context
-        paper = None
-        if question.get("paper_id"):
-            paper = await papers_collection.find_one({"_id": ObjectId(question["paper_id"])})
-        
-        # Build context
-        context = {}
-        if paper:
-            context["subject"] = paper.get("subject")
-            context["course"] = paper.get("course")
-        if question.get("marks"):
-            context["marks"] = question["marks"]
+        # Concurrent requests for the same question share one generation
+        return await singleflight(
+            f"ai_solution:{question_id}",
+            lambda: _generate_ai_solution_once(question)
+        )
+    except Exception as e:
+        return {"success": False, "message": f"Error generating AI solution: {str(e)}"}
+
+
+async def _get_existing_ai_solution(question_id) -> dict:
+    """Read just the stored AI solution of a question"""
+    db = get_database()
+    question = await db.questions.find_one({"_id": question_id}, {"ai_solution": 1})
+    if question and question.get("ai_solution") and question["ai_solution"].get("text"):
+        return question["ai_solution"]
+    return None
+
+
+async def _wait_for_ai_solution(question_id, lease_key: str) -> dict:
+    """Wait for another worker's generation to land, or for its lease to lapse"""
+    deadline = asyncio.get_running_loop().time() + AI_SOLUTION_LEASE_SECONDS
+    while asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(AI_SOLUTION_POLL_INTERVAL)
+        existing = await _get_existing_ai_solution(question_id)
+        if existing:
+            return existing
+        if not await is_lease_held(lease_key):
+            return None
+    return None
+
+
+async def _build_ai_context(question: dict) -> dict:
+    """Build Gemini prompt context (subject, course, marks) for a question"""
+    db = get_database()
+    papers_collection = db.papers
+    
+    # Get paper context
+    paper = None
+    if question.get("paper_id"):
+        paper = await papers_collection.find_one(
+            {"_id": ObjectId(question["paper_id"])},
+            {"subject": 1, "course": 1}
+        )
+    
+    # Build context
+    context = {}
+    if paper:
+        context["subject"] = paper.get("subject")
+        context["course"] = paper.get("course")
+    if not context.get("subject") and question.get("subject"):
+        context["subject"] = question["subject"]
+    if question.get("marks"):
+        context["marks"] = question["marks"]
+    return context
+
+
+async def _store_ai_solution(question_id, ai_solution: dict):
+    """Save an AI solution onto a question document"""
+    db = get_database()
+    await db.questions.update_one(
+        {"_id": question_id},
+        {
+            "$set": {
+                "ai_solution": ai_solution,
+                "has_ai_solution": True
+            }
+        }
+    )
+
+
+async def apply_cached_solutions(question_docs: List[dict]) -> int:
+    """Fill new question documents from the shared solution cache before insert"""
+    keys = [
+        solution_cache_key(doc["question_text"], doc.get("subject"), GEMINI_MODEL)
+        for doc in question_docs
+    ]
+    cached = await get_cached_solutions(keys)
+    
+    filled = 0
+    for doc, key in zip(question_docs, keys):
+        if key in cached:
+            doc["ai_solution"] = cached[key]
+            doc["has_ai_solution"] = True
+            filled += 1
+    
+    record_ingestion_fills(filled)
+    return filled
+
+
+async def _generate_ai_solution_once(question: dict):
+    """Generate and store an AI solution while holding the question's lease"""
+    question_id = question["_id"]
+    lease_key = f"ai_solution:{question_id}"
+    
+    context = await _build_ai_context(question)
+    cache_key = solution_cache_key(question["question_text"], context.get("subject"), GEMINI_MODEL)
+    
+    # The same question text may already be solved in another paper
+    shared = await get_cached_solution(cache_key)
+    if shared:
+        await _store_ai_solution(question_id, shared)
+        return {
+            "success": True,
+            "message": "AI solution already exists",
+            "ai_solution": shared,
+            "cached": True
+        }
+    
+    # Another worker may already be generating this question; wait for it
+    # (retrying if its lease lapses) instead of paying for a second call
+    while not await acquire_lease(lease_key, AI_SOLUTION_LEASE_SECONDS):
+        existing = await _wait_for_ai_solution(question_id, lease_key)
+        if existing:
+            return {
+                "success": True,
+                "message": "AI solution already exists",
+                "ai_solution": existing,
+                "cached": True
+            }
+    
+    try:
+        # The previous holder may have finished just before we got the lease
+        existing = await _get_existing_ai_solution(question_id)
+        if existing:
+            return {
+                "success": True,
+                "message": "AI solution already exists",
+                "ai_solution": existing,
+                "cached": True
+            }
         
         # Generate AI solution
         result = await gemini_generate(question["question_text"], context)
@@ -120,24 +425,19 @@ async def generate_ai_solution(question_id: str):
                 "message": f"Failed to generate AI solution: {result.get('error', 'Unknown error')}"
             }
         
+        await record_stats({"ai_generations": 1})
+        
         # Prepare AI solution object
         ai_solution = {
             "text": result["solution"],
             "generated_at": datetime.utcnow(),
-            "model": result.get("model", "gemini-pro"),
+            "model": result.get("model", GEMINI_MODEL),
             "has_ai_solution": True
         }
         
-        # Update question with AI solution
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {
-                "$set": {
-                    "ai_solution": ai_solution,
-                    "has_ai_solution": True
-                }
-            }
-        )
+        # Update question with AI solution and share it with identical questions
+        await _store_ai_solution(question_id, ai_solution)
+        await store_cached_solution(cache_key, ai_solution, question["question_text"], context.get("subject"))
         
         return {
             "success": True,
@@ -145,8 +445,177 @@ async def generate_ai_solution(question_id: str):
             "ai_solution": ai_solution,
             "cached": False
         }
+    finally:
+        # Shielded: a cancelled request must still release the lease
+        await asyncio.shield(release_lease(lease_key))
+
+
+# Streamed generations still running; keeps the tasks from being garbage-collected
+_generation_tasks = set()
+
+
+def _sse_event(event: str, data: dict) -> bytes:
+    """Format one Server-Sent Event"""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+async def _store_ai_solution_once(question_id, ai_solution: dict) -> bool:
+    """Save an AI solution only if the question has none yet; True if it was saved"""
+    db = get_database()
+    result = await db.questions.update_one(
+        {
+            "_id": question_id,
+            "$or": [{"ai_solution": None}, {"ai_solution.text": {"$in": [None, ""]}}]
+        },
+        {
+            "$set": {
+                "ai_solution": ai_solution,
+                "has_ai_solution": True
+            }
+        }
+    )
+    return result.modified_count == 1
+
+
+async def stream_ai_solution(question_id: str):
+    """
+    Prepare a streamed AI solution for a question
+    
+    Returns a result dict whose "events" is an async iterator of SSE bytes:
+    "chunk" events carry text as Gemini produces it, then "done" carries the
+    saved ai_solution (or "error"). Stored and shared-cache solutions are
+    sent as a single chunk.
+    """
+    db = get_database()
+    questions_collection = db.questions
+    
+    if not is_gemini_configured():
+        return {
+            "success": False,
+            "message": "AI service not configured. Please set GEMINI_API_KEY in .env file"
+        }
+    
+    try:
+        question = await questions_collection.find_one(
+            {"_id": ObjectId(question_id)},
+            {"question_text": 1, "paper_id": 1, "subject": 1, "marks": 1, "ai_solution": 1}
+        )
     except Exception as e:
-        return {"success": False, "message": f"Error generating AI solution: {str(e)}"}
+        return {"success": False, "message": str(e)}
+    if not question:
+        return {"success": False, "message": "Question not found"}
+    
+    return {"success": True, "events": _ai_solution_events(question)}
+
+
+async def _ai_solution_events(question: dict) -> AsyncIterator[bytes]:
+    question_id = question["_id"]
+    lease_key = f"ai_solution:{question_id}"
+    
+    def existing_events(ai_solution: dict):
+        return [
+            _sse_event("chunk", {"text": ai_solution["text"]}),
+            _sse_event("done", {"ai_solution": ai_solution, "cached": True})
+        ]
+    
+    if question.get("ai_solution") and question["ai_solution"].get("text"):
+        for event in existing_events(question["ai_solution"]):
+            yield event
+        return
+    
+    context = await _build_ai_context(question)
+    cache_key = solution_cache_key(question["question_text"], context.get("subject"), GEMINI_MODEL)
+    shared = await get_cached_solution(cache_key)
+    if shared:
+        await _store_ai_solution_once(question_id, shared)
+        for event in existing_events(shared):
+            yield event
+        return
+    
+    # Someone else is generating this question: wait for their result
+    while not await acquire_lease(lease_key, AI_SOLUTION_LEASE_SECONDS):
+        yield _sse_event("waiting", {"message": "Solution is being generated"})
+        existing = await _wait_for_ai_solution(question_id, lease_key)
+        if existing:
+            for event in existing_events(existing):
+                yield event
+            return
+    
+    # Generation runs detached from this response: if the client disconnects,
+    # the answer is still saved and the lease released
+    events = asyncio.Queue()
+    task = asyncio.create_task(_generate_streamed_solution(question, context, cache_key, lease_key, events))
+    _generation_tasks.add(task)
+    task.add_done_callback(_generation_tasks.discard)
+    
+    while True:
+        event, data = await events.get()
+        yield _sse_event(event, data)
+        if event != "chunk":
+            return
+
+
+async def _generate_streamed_solution(
+    question: dict,
+    context: dict,
+    cache_key: str,
+    lease_key: str,
+    events: asyncio.Queue
+):
+    """
+    Stream a Gemini answer into events, then save it; runs as its own task
+
+    Always ends the stream with a "done" or "error" event, even if the task
+    is cancelled (e.g. at shutdown), so the relaying response never hangs.
+    """
+    question_id = question["_id"]
+    finished = False
+    
+    def finish(event: str, data: dict):
+        nonlocal finished
+        finished = True
+        events.put_nowait((event, data))
+    
+    try:
+        existing = await _get_existing_ai_solution(question_id)
+        if existing:
+            events.put_nowait(("chunk", {"text": existing["text"]}))
+            finish("done", {"ai_solution": existing, "cached": True})
+            return
+        
+        parts = []
+        try:
+            async for text in gemini_stream(question["question_text"], context):
+                parts.append(text)
+                events.put_nowait(("chunk", {"text": text}))
+        except Exception as e:
+            finish("error", {"message": f"AI generation failed: {str(e)}"})
+            return
+        
+        if not parts:
+            finish("error", {"message": "No response generated from AI"})
+            return
+        await record_stats({"ai_generations": 1})
+        
+        ai_solution = {
+            "text": "".join(parts),
+            "generated_at": datetime.utcnow(),
+            "model": GEMINI_MODEL,
+            "has_ai_solution": True
+        }
+        
+        # Save only if nothing landed meanwhile, so the stored text is written exactly once
+        if await _store_ai_solution_once(question_id, ai_solution):
+            await store_cached_solution(cache_key, ai_solution, question["question_text"], context.get("subject"))
+        else:
+            ai_solution = await _get_existing_ai_solution(question_id) or ai_solution
+        finish("done", {"ai_solution": ai_solution, "cached": False})
+    except Exception as e:
+        finish("error", {"message": f"Error generating AI solution: {str(e)}"})
+    finally:
+        if not finished:
+            events.put_nowait(("error", {"message": "AI generation was interrupted"}))
+        await asyncio.shield(release_lease(lease_key))
 
 
 async def get_video_solutions(question_id: str, force_refresh: bool = False):
@@ -198,6 +667,8 @@ async def get_video_solutions(question_id: str, force_refresh: bool = False):
                 "video_links": []
             }
         
+        await record_stats({"video_fetches": 1})
+        
         # Format video links
         video_links = []
         for video in result.get("videos", []):
@@ -242,44 +713,62 @@ async def report_question_issue(question_id: str, report: ReportIssue):
     """Report an issue with a question"""
     db = get_database()
     questions_collection = db.questions
+    reports_collection = db.question_reports
     
     try:
+        question = await questions_collection.find_one({"_id": ObjectId(question_id)}, {"paper_id": 1})
+        if not question:
+            return {"success": False, "message": "Question not found"}
+        
+        # Reports live in their own collection so question reads never carry them
         report_dict = {
+            "question_id": question_id,
+            "paper_id": question.get("paper_id"),
             "issue_type": report.issue_type,
             "description": report.description,
             "user_id": report.user_id,
-            "reported_at": datetime.utcnow()
+            "status": "open",
+            "created_at": datetime.utcnow()
         }
+        result = await reports_collection.insert_one(report_dict)
         
-        result = await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$push": {"reports": report_dict}}
-        )
-        
-        if result.modified_count == 0:
-            return {"success": False, "message": "Question not found"}
-        
-        return {"success": True, "message": "Issue reported successfully"}
+        return {
+            "success": True,
+            "message": "Issue reported successfully",
+            "report_id": str(result.inserted_id)
+        }
     except Exception as e:
         return {"success": False, "message": str(e)}
 
 
-async def vote_question(question_id: str, vote_type: str):
-    """Upvote or downvote a question"""
+async def vote_question(question_id: str, user_id: str, vote_type: str):
+    """Upvote, downvote or retract a vote on a question (one vote per user)"""
     db = get_database()
     questions_collection = db.questions
     
     try:
-        field = "upvotes" if vote_type == "up" else "downvotes"
-        
-        result = await questions_collection.update_one(
+        question = await questions_collection.find_one(
             {"_id": ObjectId(question_id)},
-            {"$inc": {field: 1}}
+            {"upvotes": 1, "downvotes": 1}
         )
-        
-        if result.modified_count == 0:
+        if not question:
             return {"success": False, "message": "Question not found"}
         
-        return {"success": True, "message": f"Question {vote_type}voted"}
+        # Buffered; vote states and totals are written in bulk by the flusher
+        previous = await question_votes.record(question_id, user_id, VOTE_VALUES[vote_type])
+        question_votes.apply_pending(question, question_id)
+        
+        if vote_type == "retract":
+            message = "Vote retracted" if previous else "No vote to retract"
+        else:
+            message = f"Question {vote_type}voted"
+        
+        return {
+            "success": True,
+            "message": message,
+            "vote": vote_type,
+            "upvotes": question["upvotes"],
+            "downvotes": question["downvotes"]
+        }
     except Exception as e:
         return {"success": False, "message": str(e)}
@@ -0,0 +1,142 @@
+from app.config.database import get_database
+from datetime import datetime
+from bson import ObjectId
+from typing import Optional
+from pymongo import UpdateOne
+from app.utils.pagination import encode_cursor, keyset_query
+
+REPORT_STATUSES = ("open", "resolved", "dismissed")
+REPORT_QUESTION_PREVIEW = 300
+
+
+async def get_report_queue(
+    status: Optional[str] = "open",
+    issue_type: Optional[str] = None,
+    question_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+):
+    """
+    Get a page of the moderation queue, newest reports first
+
+    Pages by keyset on (created_at, _id) using the status index, so deep
+    pages cost the same as the first one.
+    """
+    db = get_database()
+    reports_collection = db.question_reports
+    questions_collection = db.questions
+
+    query = {}
+    if status:
+        query["status"] = status
+    if issue_type:
+        query["issue_type"] = issue_type
+    if question_id:
+        query["question_id"] = question_id
+
+    if cursor:
+        try:
+            query = keyset_query(query, cursor)
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+
+    find_cursor = reports_collection.find(query).sort([("created_at", -1), ("_id", -1)]).limit(limit)
+
+    reports = []
+    next_cursor = None
+    async for report in find_cursor:
+        next_cursor = encode_cursor(report)
+        report["id"] = str(report.pop("_id"))
+        reports.append(report)
+
+    # A short page is the last one
+    if len(reports) < limit:
+        next_cursor = None
+
+    # Attach question previews with one lookup
+    question_ids = list({ObjectId(r["question_id"]) for r in reports if ObjectId.is_valid(r.get("question_id"))})
+    questions = {}
+    if question_ids:
+        question_cursor = questions_collection.find(
+            {"_id": {"$in": question_ids}},
+            {"question_number": 1, "question_text": 1, "paper_id": 1}
+        )
+        async for question in question_cursor:
+            question["question_text"] = question.get("question_text", "")[:REPORT_QUESTION_PREVIEW]
+            questions[str(question.pop("_id"))] = question
+    for report in reports:
+        report["question"] = questions.get(report.get("question_id"))
+
+    return {"success": True, "reports": reports, "limit": limit, "next_cursor": next_cursor}
+
+
+async def review_report(report_id: str, status: str, reviewer_id: str, note: Optional[str] = None):
+    """Mark an open report as resolved or dismissed"""
+    db = get_database()
+    reports_collection = db.question_reports
+
+    try:
+        report = await reports_collection.find_one_and_update(
+            {"_id": ObjectId(report_id), "status": "open"},
+            {"$set": {
+                "status": status,
+                "reviewed_by": reviewer_id,
+                "review_note": note,
+                "reviewed_at": datetime.utcnow()
+            }},
+            projection={"_id": 1}
+        )
+        if not report:
+            existing = await reports_collection.find_one({"_id": ObjectId(report_id)}, {"status": 1})
+            if not existing:
+                return {"success": False, "message": "Report not found"}
+            return {"success": False, "message": f"Report already {existing['status']}"}
+
+        return {"success": True, "message": f"Report {status}"}
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+
+async def migrate_embedded_reports() -> int:
+    """
+    Move reports still embedded in question documents into question_reports
+
+    Runs once through run_migration_once. Reports are upserted on
+    (question_id, user_id, created_at, issue_type), so a retried or
+    overlapping run never duplicates them.
+    """
+    db = get_database()
+    questions_collection = db.questions
+    reports_collection = db.question_reports
+
+    migrated = 0
+    cursor = questions_collection.find(
+        {"reports": {"$exists": True}},
+        {"reports": 1, "paper_id": 1}
+    )
+    async for question in cursor:
+        operations = []
+        for report in question.get("reports") or []:
+            key = {
+                "question_id": str(question["_id"]),
+                "user_id": report.get("user_id"),
+                # Deterministic fallback so every run derives the same key
+                "created_at": report.get("reported_at") or question["_id"].generation_time.replace(tzinfo=None),
+                "issue_type": report.get("issue_type")
+            }
+            operations.append(UpdateOne(
+                key,
+                {"$setOnInsert": {
+                    "paper_id": question.get("paper_id"),
+                    "description": report.get("description"),
+                    "status": "open"
+                }},
+                upsert=True
+            ))
+        if operations:
+            await reports_collection.bulk_write(operations, ordered=False)
+        await questions_collection.update_one({"_id": question["_id"]}, {"$unset": {"reports": ""}})
+        migrated += len(operations)
+    if migrated:
+        print(f"Moved {migrated} embedded question reports to question_reports")
+    return migrated
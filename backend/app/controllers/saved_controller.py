@@ -0,0 +1,149 @@
+from app.config.database import get_database
+from datetime import datetime, timedelta
+from bson import ObjectId
+from typing import Optional
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.utils.pagination import encode_cursor, keyset_query
+
+# item_type -> collection the saved item lives in
+SAVED_ITEM_COLLECTIONS = {"paper": "papers", "question": "questions"}
+
+
+async def save_item(user_id: str, item_type: str, item_id: str):
+    """Save a paper or question for a user (saving again keeps the original time)"""
+    if not ObjectId.is_valid(item_id):
+        return {"success": False, "message": f"Invalid {item_type} ID"}
+
+    db = get_database()
+    try:
+        await db.saved_items.update_one(
+            {"user_id": user_id, "item_type": item_type, "item_id": ObjectId(item_id)},
+            {"$setOnInsert": {"saved_at": datetime.utcnow()}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        pass  # A concurrent save of the same item won the upsert
+    return {"success": True, "message": f"{item_type.capitalize()} saved"}
+
+
+async def unsave_item(user_id: str, item_type: str, item_id: str):
+    """Remove a saved paper or question"""
+    if not ObjectId.is_valid(item_id):
+        return {"success": False, "message": f"Invalid {item_type} ID"}
+
+    db = get_database()
+    await db.saved_items.delete_one({"user_id": user_id, "item_type": item_type, "item_id": ObjectId(item_id)})
+    return {"success": True, "message": f"{item_type.capitalize()} unsaved"}
+
+
+async def get_saved_counts(user_id: str):
+    """Count a user's saved papers and questions (served from the saved_items index)"""
+    db = get_database()
+    return {
+        "success": True,
+        "papers": await db.saved_items.count_documents({"user_id": user_id, "item_type": "paper"}),
+        "questions": await db.saved_items.count_documents({"user_id": user_id, "item_type": "question"})
+    }
+
+
+async def get_saved_items(
+    user_id: str,
+    item_type: str,
+    projection: dict,
+    cursor: Optional[str] = None,
+    limit: int = 50
+):
+    """
+    Get a page of a user's saved papers or questions, most recently saved first
+
+    One aggregation walks the (user_id, item_type, saved_at, _id) index and
+    joins each saved row to its paper or question by _id, so the cost of a
+    page is independent of how many items the user has saved. Items deleted
+    since they were saved are skipped and their saved rows removed.
+    """
+    query = {"user_id": user_id, "item_type": item_type}
+    if cursor:
+        try:
+            query = keyset_query(query, cursor, field="saved_at")
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+
+    db = get_database()
+    pipeline = [
+        {"$match": query},
+        {"$sort": {"saved_at": -1, "_id": -1}},
+        {"$limit": limit},
+        {"$lookup": {
+            "from": SAVED_ITEM_COLLECTIONS[item_type],
+            "let": {"item_id": "$item_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$item_id"]}}},
+                {"$project": projection}
+            ],
+            "as": "item"
+        }}
+    ]
+
+    items = []
+    orphans = []
+    rows = 0
+    last_row = None
+    async for row in db.saved_items.aggregate(pipeline):
+        rows += 1
+        last_row = row
+        if not row["item"]:
+            orphans.append(row["_id"])
+            continue
+        item = row["item"][0]
+        item["id"] = str(item.pop("_id"))
+        item["saved_at"] = row["saved_at"]
+        items.append(item)
+
+    if orphans:
+        # The item was deleted since it was saved; drop the row so counts stay right
+        await db.saved_items.delete_many({"_id": {"$in": orphans}})
+
+    next_cursor = encode_cursor(last_row, field="saved_at") if rows == limit else None
+    return {"success": True, "items": items, "next_cursor": next_cursor}
+
+
+async def migrate_saved_arrays() -> int:
+    """
+    Move saved_papers/saved_questions arrays on user documents into saved_items
+
+    Runs once through run_migration_once; upserts make a retried run safe.
+    """
+    db = get_database()
+    users_collection = db.users
+    saved_collection = db.saved_items
+
+    migrated = 0
+    cursor = users_collection.find(
+        {"$or": [{"saved_papers": {"$exists": True}}, {"saved_questions": {"$exists": True}}]},
+        {"saved_papers": 1, "saved_questions": 1}
+    )
+    async for user in cursor:
+        user_id = str(user["_id"])
+        now = datetime.utcnow()
+        operations = []
+        for item_type, field in (("paper", "saved_papers"), ("question", "saved_questions")):
+            saved_ids = [i for i in user.get(field) or [] if ObjectId.is_valid(i)]
+            # Arrays were appended to, so later entries were saved more recently
+            for age, item_id in enumerate(reversed(saved_ids)):
+                key = {"user_id": user_id, "item_type": item_type, "item_id": ObjectId(item_id)}
+                operations.append(UpdateOne(
+                    key,
+                    {"$setOnInsert": {"saved_at": now - timedelta(milliseconds=age)}},
+                    upsert=True
+                ))
+        if operations:
+            await saved_collection.bulk_write(operations, ordered=False)
+        await users_collection.update_one(
+            {"_id": user["_id"]},
+            {"$unset": {"saved_papers": "", "saved_questions": ""}}
+        )
+        migrated += len(operations)
+    if migrated:
+        print(f"Moved {migrated} saved items from user documents to saved_items")
+    return migrated
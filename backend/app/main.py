@@ -1,3 +1,4 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -6,12 +7,36 @@ from app.config.database import connect_to_mongo, close_mongo_connection
 from app.routes import auth_routes, paper_routes, question_routes
 from app.routes import video_routes
 from app.routes import user_routes, faculty_routes, admin_routes
+from app.utils.job_queue import register_job_handler, start_job_workers, stop_job_workers
+from app.controllers.paper_controller import (
+    PAPER_INGESTION_JOB,
+    PAPER_AI_SOLUTIONS_JOB,
+    ingest_paper_questions,
+    generate_paper_ai_solutions
+)
+from app.utils.ocr_extractor import shutdown_pdf_executor
+from app.utils.paper_facets import ensure_paper_facets, normalize_paper_years
+from app.utils.stats_rollup import ensure_stats_totals
+from app.controllers.report_controller import migrate_embedded_reports
+from app.controllers.saved_controller import migrate_saved_arrays
+from app.utils.migrations import run_migration_once
+from app.utils.serialization import FastJSONResponse, FastJSONRoute
+from app.utils.compression import CompressionMiddleware
+from app.utils.write_behind import start_write_behind, stop_write_behind
+from app.utils.password_hashing import shutdown_password_executor
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
 
 app = FastAPI(
     title="ExamVerse API",
     description="Backend API for ExamVerse - Previous-year papers with AI solutions",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
+app.router.route_class = FastJSONRoute
+
+# Compress JSON responses above COMPRESSION_MIN_SIZE bytes (brotli or gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
 
 # CORS middleware
 app.add_middleware(
@@ -20,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Create uploads directory if it doesn't exist
@@ -32,13 +58,26 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 @app.on_event("startup")
 async def startup_event():
-    """Connect to MongoDB on startup"""
+    """Connect to MongoDB and start background job workers on startup"""
     await connect_to_mongo()
+    await run_migration_once("paper_year_as_string", normalize_paper_years)
+    await ensure_paper_facets()
+    await ensure_stats_totals()
+    await run_migration_once("question_reports_from_embedded", migrate_embedded_reports)
+    await run_migration_once("saved_items_from_user_arrays", migrate_saved_arrays)
+    register_job_handler(PAPER_INGESTION_JOB, ingest_paper_questions)
+    register_job_handler(PAPER_AI_SOLUTIONS_JOB, generate_paper_ai_solutions)
+    start_job_workers()
+    start_write_behind()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close MongoDB connection on shutdown"""
+    """Stop job workers, flush buffered writes and close MongoDB connection on shutdown"""
+    await stop_job_workers()
+    await stop_write_behind()
+    shutdown_pdf_executor()
+    shutdown_password_executor()
     await close_mongo_connection()
 
 
@@ -69,6 +108,7 @@ async def root():
                 "profile_update": "/user/profile (PUT)",
                 "saved_papers": "/user/saved/papers",
                 "saved_questions": "/user/saved/questions",
+                "saved_counts": "/user/saved/counts",
                 "save_paper": "/user/saved/papers/{paper_id} (POST)",
                 "unsave_paper": "/user/saved/papers/{paper_id} (DELETE)",
                 "save_question": "/user/saved/questions/{question_id} (POST)",
@@ -84,19 +124,27 @@ async def root():
                 "approve_faculty": "/admin/faculty/{user_id}/approve",
                 "reject_faculty": "/admin/faculty/{user_id}/reject",
                 "reports": "/admin/reports",
-                "analytics": "/admin/analytics"
+                "analytics": "/admin/analytics?days=30",
+                "rebuild_stats": "/admin/stats/rebuild (POST)",
+                "metrics": "/admin/metrics",
+                "indexes": "/admin/indexes"
             },
             "papers": {
                 "get_all": "/papers",
                 "get_by_id": "/papers/{id}",
+                "facets": "/papers/facets",
                 "create": "/papers (POST)",
                 "upload": "/papers/upload (POST - multipart/form-data)",
+                "ingestion_status": "/papers/{id}/ingestion",
+                "ai_solutions": "/papers/{id}/ai-solutions (POST to start, GET for progress)",
                 "add_solution": "/papers/{id}/solution (POST)",
                 "faculty_papers": "/papers/faculty/{faculty_id}"
             },
             "questions": {
                 "get_by_paper": "/questions/paper/{paper_id}",
+                "search": "/questions/search?q=",
                 "get_by_id": "/questions/{id}",
+                "bulk_create": "/questions/bulk (POST)",
                 "ai_solution": "/questions/{id}/ai-solution (POST)",
                 "video_solutions": "/questions/{id}/videos",
                 "report": "/questions/{id}/report (POST)",
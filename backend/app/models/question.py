@@ -20,6 +20,10 @@ class QuestionCreate(QuestionBase):
     pass
 
 
+class QuestionBulkCreate(BaseModel):
+    questions: List[QuestionCreate] = Field(..., min_length=1, max_length=200)
+
+
 class AISolution(BaseModel):
     text: str
     generated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -47,7 +51,6 @@ class QuestionInDB(QuestionBase):
     tags: List[str] = []
     upvotes: int = 0
     downvotes: int = 0
-    reports: List[dict] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -55,3 +58,7 @@ class ReportIssue(BaseModel):
     issue_type: str  # wrong_answer, wrong_ocr, missing_topic
     description: str
     user_id: str
+
+
+class ReportReview(BaseModel):
+    note: Optional[str] = None
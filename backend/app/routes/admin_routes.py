@@ -1,9 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
 from app.config.database import get_database
-from app.utils.jwt import require_role
+from app.config.indexes import get_index_report
+from app.utils.jwt import require_role, get_token_cache_stats
+from app.utils.ocr_extractor import get_extraction_stats
+from app.utils.solution_cache import get_cache_stats
+from app.utils.youtube_search import get_search_cache_stats
+from app.utils.paper_facets import rebuild_paper_facets
+from app.utils.stats_rollup import get_stats_rollup, rebuild_stats_totals
+from app.utils.write_behind import get_write_behind_stats
+from app.utils.password_hashing import get_password_hashing_stats
+from app.models.question import ReportReview
+from app.controllers.report_controller import REPORT_STATUSES, get_report_queue, review_report
+from app.utils.export import since_query, stream_ndjson
+from app.utils.projection import paper_list_projection, question_list_projection
 from bson import ObjectId
+from app.utils.serialization import FastJSONRoute
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=FastJSONRoute)
 
 
 @router.get("/faculty/pending")
@@ -40,18 +56,152 @@ async def reject_faculty(user_id: str, current_user: dict = Depends(require_role
 
 
 @router.get("/reports")
-async def get_reports(current_user: dict = Depends(require_role(["admin"]))):
-    # Stub endpoint: return empty list for now
-    return []
+async def get_reports(
+    status: Optional[str] = Query("open", description="open, resolved or dismissed"),
+    issue_type: Optional[str] = None,
+    question_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    if status is not None and status not in REPORT_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid report status")
+    result = await get_report_queue(status, issue_type, question_id, cursor, limit)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+
+@router.post("/reports/{report_id}/resolve")
+async def resolve_report(
+    report_id: str,
+    review: Optional[ReportReview] = None,
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    result = await review_report(report_id, "resolved", current_user["user_id"], review.note if review else None)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
+
+
+@router.post("/reports/{report_id}/dismiss")
+async def dismiss_report(
+    report_id: str,
+    review: Optional[ReportReview] = None,
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    result = await review_report(report_id, "dismissed", current_user["user_id"], review.note if review else None)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
 
 
 @router.get("/analytics")
-async def get_analytics(current_user: dict = Depends(require_role(["admin"]))):
+async def get_analytics(
+    days: int = Query(30, ge=1, le=365, description="Length of the daily time series"),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    rollup = await get_stats_rollup(days)
+    return {**rollup.pop("totals"), **rollup}
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: dict = Depends(require_role(["admin"]))):
+    return {
+        "pdf_extraction": get_extraction_stats(),
+        "ai_solution_cache": get_cache_stats(),
+        "youtube_search_cache": get_search_cache_stats(),
+        "write_behind": get_write_behind_stats(),
+        "jwt_claims_cache": get_token_cache_stats(),
+        "password_hashing": get_password_hashing_stats(),
+    }
+
+
+@router.get("/indexes")
+async def get_indexes(current_user: dict = Depends(require_role(["admin"]))):
     db = get_database()
-    users = db.users
-    papers = db.papers
-    questions = db.questions
-    u = await users.count_documents({})
-    p = await papers.count_documents({})
-    q = await questions.count_documents({})
-    return {"users": u, "papers": p, "questions": q}
+    report = await get_index_report(db)
+    return {
+        "in_sync": all(c["in_sync"] for c in report.values()),
+        "collections": report,
+    }
+
+
+@router.post("/facets/rebuild")
+async def rebuild_facets(current_user: dict = Depends(require_role(["admin"]))):
+    combinations = await rebuild_paper_facets()
+    return {"success": True, "combinations": combinations}
+
+
+@router.post("/stats/rebuild")
+async def rebuild_stats(current_user: dict = Depends(require_role(["admin"]))):
+    totals = await rebuild_stats_totals()
+    return {"success": True, "totals": totals}
+
+
+def _export_response(collection, query: dict, projection: dict, name: str, gzip: bool) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%dT%H%M%SZ}.ndjson" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    # A gzip file, not Content-Encoding: clients would otherwise decode it on the fly
+    # and save plain NDJSON under the .gz name
+    return StreamingResponse(
+        stream_ndjson(collection, query, projection, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers=headers,
+    )
+
+
+@router.get("/export/papers")
+async def export_papers(
+    college: Optional[str] = None,
+    course: Optional[str] = None,
+    subject: Optional[str] = None,
+    year: Optional[str] = None,
+    exam_type: Optional[str] = None,
+    faculty_id: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only papers created at or after this time (ISO 8601)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export"),
+    gzip: bool = Query(False, description="Gzip the stream"),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    try:
+        projection = paper_list_projection("full", fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filters = {
+        "college": college,
+        "course": course,
+        "subject": subject,
+        "year": year,
+        "exam_type": exam_type,
+        "faculty_id": faculty_id,
+    }
+    query = {k: v for k, v in filters.items() if v is not None}
+    query.update(since_query(since))
+    return _export_response(get_database().papers, query, projection, "papers", gzip)
+
+
+@router.get("/export/questions")
+async def export_questions(
+    paper_id: Optional[str] = None,
+    subject: Optional[str] = None,
+    source: Optional[str] = Query(None, description="ocr or manual"),
+    has_ai_solution: Optional[bool] = None,
+    since: Optional[datetime] = Query(None, description="Only questions created at or after this time (ISO 8601)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export"),
+    gzip: bool = Query(False, description="Gzip the stream"),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    try:
+        projection = question_list_projection("full", fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filters = {
+        "paper_id": paper_id,
+        "subject": subject,
+        "source": source,
+        "has_ai_solution": has_ai_solution,
+    }
+    query = {k: v for k, v in filters.items() if v is not None}
+    query.update(since_query(since))
+    return _export_response(get_database().questions, query, projection, "questions", gzip)
@@ -1,14 +1,27 @@
 from fastapi import APIRouter, HTTPException
 from app.models.user import UserRegister, UserLogin
 from app.controllers.auth_controller import register_user, login_user
+from app.utils.password_hashing import PasswordHashingBusy
+from app.utils.serialization import FastJSONRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=FastJSONRoute)
+
+
+def _busy(error: PasswordHashingBusy) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
 
 
 @router.post("/register")
 async def register(user: UserRegister):
     """Register a new user"""
-    result = await register_user(user)
+    try:
+        result = await register_user(user)
+    except PasswordHashingBusy as e:
+        raise _busy(e)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -22,7 +35,10 @@ async def register(user: UserRegister):
 @router.post("/login")
 async def login(user: UserLogin):
     """Login a user"""
-    result = await login_user(user)
+    try:
+        result = await login_user(user)
+    except PasswordHashingBusy as e:
+        raise _busy(e)
     
     if not result["success"]:
         raise HTTPException(status_code=401, detail=result["message"])
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from typing import Optional
 from app.config.database import get_database
 from app.utils.jwt import get_current_user, require_role
 from app.controllers.paper_controller import get_faculty_papers
@@ -6,10 +7,12 @@ from app.controllers.paper_controller import create_paper
 from app.controllers.paper_controller import update_paper
 from app.controllers.paper_controller import delete_paper
 from app.controllers.paper_controller import get_paper_by_id
+from app.utils.write_behind import paper_views
 from bson import ObjectId
 from datetime import datetime
+from app.utils.serialization import FastJSONRoute
 
-router = APIRouter(prefix="/faculty", tags=["Faculty"])
+router = APIRouter(prefix="/faculty", tags=["Faculty"], route_class=FastJSONRoute)
 
 
 @router.get("/dashboard")
@@ -31,15 +34,15 @@ async def faculty_dashboard(current_user: dict = Depends(require_role(["faculty"
 
 
 @router.get("/papers")
-async def my_papers(current_user: dict = Depends(require_role(["faculty", "admin"]))):
-    db = get_database()
-    papers = db.papers
-    results = []
-    cursor = papers.find({"faculty_id": current_user["user_id"]}).sort("created_at", -1)
-    async for p in cursor:
-        p["id"] = str(p.pop("_id"))
-        results.append(p)
-    return results
+async def my_papers(
+    view: str = Query("summary", pattern="^(summary|full)$", description="Row shape: compact summary or full documents"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (overrides view)"),
+    current_user: dict = Depends(require_role(["faculty", "admin"]))
+):
+    result = await get_faculty_papers(current_user["user_id"], view, fields)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result["papers"]
 
 
 @router.get("/papers/{paper_id}/analytics")
@@ -55,6 +58,6 @@ async def paper_analytics(paper_id: str, current_user: dict = Depends(require_ro
     return {
         "paperId": paper_id,
         "questionCount": q_count,
-        "views": 0,
+        "views": p.get("views", 0) + paper_views.pending(paper_id),
         "solves": 0,
     }
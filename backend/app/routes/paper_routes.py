@@ -9,11 +9,17 @@ from app.controllers.paper_controller import (
     delete_paper,
     get_faculty_papers,
     upload_paper_with_pdf,
-    update_paper_solution
+    update_paper_solution,
+    get_paper_ingestion_status,
+    queue_paper_ai_solutions,
+    get_paper_ai_solutions_status,
+    get_paper_browse_facets
 )
 from app.utils.jwt import get_current_user, require_role
+from app.utils.paper_facets import normalize_year
+from app.utils.serialization import FastJSONRoute
 
-router = APIRouter(prefix="/papers", tags=["Papers"])
+router = APIRouter(prefix="/papers", tags=["Papers"], route_class=FastJSONRoute)
 
 
 @router.post("/", dependencies=[Depends(require_role(["faculty"]))])
@@ -39,14 +45,18 @@ async def get_papers(
     exam_type: Optional[str] = Query(None),
     has_faculty_solution: Optional[bool] = Query(None),
     skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset pagination)"),
+    count: Optional[str] = Query(None, pattern="^(exact|estimated|none)$", description="How to compute total"),
+    view: str = Query("summary", pattern="^(summary|full)$", description="Row shape: compact summary or full documents"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (overrides view)")
 ):
     """Get all papers with optional filters"""
     filters = {
         "college": college,
         "course": course,
         "subject": subject,
-        "year": year,
+        "year": normalize_year(year),
         "exam_type": exam_type,
         "has_faculty_solution": has_faculty_solution
     }
@@ -54,7 +64,39 @@ async def get_papers(
     # Remove None values
     filters = {k: v for k, v in filters.items() if v is not None}
     
-    result = await get_all_papers(filters, skip, limit)
+    result = await get_all_papers(filters, skip, limit, cursor=cursor, count=count, view=view, fields=fields)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
+    return result
+
+
+@router.get("/facets")
+async def get_facets(
+    college: Optional[str] = Query(None),
+    course: Optional[str] = Query(None),
+    subject: Optional[str] = Query(None),
+    year: Optional[str] = Query(None),
+    exam_type: Optional[str] = Query(None)
+):
+    """Get filter values with paper counts for the paper browser"""
+    filters = {
+        "college": college,
+        "course": course,
+        "subject": subject,
+        "year": normalize_year(year),
+        "exam_type": exam_type
+    }
+    
+    # Remove None values
+    filters = {k: v for k, v in filters.items() if v is not None}
+    
+    result = await get_paper_browse_facets(filters)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
     return result
 
 
@@ -99,9 +141,17 @@ async def delete_paper_route(
 
 
 @router.get("/faculty/{faculty_id}")
-async def get_faculty_papers_route(faculty_id: str):
+async def get_faculty_papers_route(
+    faculty_id: str,
+    view: str = Query("summary", pattern="^(summary|full)$", description="Row shape: compact summary or full documents"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (overrides view)")
+):
     """Get all papers by a faculty member"""
-    result = await get_faculty_papers(faculty_id)
+    result = await get_faculty_papers(faculty_id, view, fields)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
     return result
 
 
@@ -117,7 +167,7 @@ async def upload_paper_route(
     extract_questions: bool = Form(True),
     current_user: dict = Depends(get_current_user)
 ):
-    """Upload paper PDF with automatic question extraction (Faculty only)"""
+    """Upload paper PDF and queue question extraction (Faculty only)"""
     result = await upload_paper_with_pdf(
         file=file,
         subject=subject,
@@ -137,6 +187,42 @@ async def upload_paper_route(
     return result
 
 
+@router.get("/{paper_id}/ingestion")
+async def get_ingestion_status_route(paper_id: str):
+    """Get question-extraction status for an uploaded paper"""
+    result = await get_paper_ingestion_status(paper_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+    
+    return result
+
+
+@router.post("/{paper_id}/ai-solutions", dependencies=[Depends(require_role(["faculty", "admin"]))])
+async def generate_paper_ai_solutions_route(
+    paper_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Queue AI solution generation for every unsolved question of a paper"""
+    result = await queue_paper_ai_solutions(paper_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
+    return result
+
+
+@router.get("/{paper_id}/ai-solutions")
+async def get_paper_ai_solutions_route(paper_id: str):
+    """Get progress of the paper-wide AI solution batch"""
+    result = await get_paper_ai_solutions_status(paper_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+    
+    return result
+
+
 @router.post("/{paper_id}/solution", dependencies=[Depends(require_role(["faculty"]))])
 async def upload_solution_route(
     paper_id: str,
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.models.question import QuestionCreate, ReportIssue
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.utils.jwt import get_current_user
+from app.models.question import QuestionCreate, QuestionBulkCreate, ReportIssue
 from app.controllers.question_controller import (
     create_question,
+    create_questions_bulk,
+    search_questions,
     get_questions_by_paper,
     get_question_by_id,
     generate_ai_solution,
+    stream_ai_solution,
     get_video_solutions,
     report_question_issue,
     vote_question
 )
+from app.utils.serialization import FastJSONRoute
 
-router = APIRouter(prefix="/questions", tags=["Questions"])
+router = APIRouter(prefix="/questions", tags=["Questions"], route_class=FastJSONRoute)
 
 
 @router.post("/")
@@ -24,10 +31,45 @@ async def create_question_route(question: QuestionCreate):
     return result
 
 
+@router.post("/bulk")
+async def create_questions_bulk_route(payload: QuestionBulkCreate):
+    """Create many questions in one request"""
+    result = await create_questions_bulk(payload.questions)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
+    return result
+
+
+@router.get("/search")
+async def search_questions_route(
+    q: str = Query(..., min_length=2, max_length=200, description="Search terms"),
+    subject: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=50)
+):
+    """Search past questions across all papers"""
+    result = await search_questions(q, subject=subject, skip=skip, limit=limit)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
+    return result
+
+
 @router.get("/paper/{paper_id}")
-async def get_questions_by_paper_route(paper_id: str):
+async def get_questions_by_paper_route(
+    paper_id: str,
+    view: str = Query("summary", pattern="^(summary|full)$", description="Row shape: compact summary or full documents"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (overrides view)")
+):
     """Get all questions for a paper"""
-    result = await get_questions_by_paper(paper_id)
+    result = await get_questions_by_paper(paper_id, view, fields)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
     return result
 
 
@@ -53,6 +95,21 @@ async def generate_ai_solution_route(question_id: str):
     return result
 
 
+@router.post("/{question_id}/ai-solution/stream")
+async def stream_ai_solution_route(question_id: str):
+    """Generate AI solution for a question, streamed as Server-Sent Events"""
+    result = await stream_ai_solution(question_id)
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    
+    return StreamingResponse(
+        result["events"],
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{question_id}/videos")
 async def get_video_solutions_route(
     question_id: str,
@@ -79,12 +136,16 @@ async def report_issue_route(question_id: str, report: ReportIssue):
 
 
 @router.post("/{question_id}/vote/{vote_type}")
-async def vote_question_route(question_id: str, vote_type: str):
-    """Upvote or downvote a question"""
-    if vote_type not in ["up", "down"]:
+async def vote_question_route(
+    question_id: str,
+    vote_type: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Upvote, downvote or retract a vote on a question"""
+    if vote_type not in ["up", "down", "retract"]:
         raise HTTPException(status_code=400, detail="Invalid vote type")
     
-    result = await vote_question(question_id, vote_type)
+    result = await vote_question(question_id, current_user["user_id"], vote_type)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 from app.config.database import get_database
 from app.utils.jwt import get_current_user
+from app.utils.projection import paper_list_projection, question_list_projection
 from bson import ObjectId
-from datetime import datetime
+from app.controllers.saved_controller import get_saved_counts, get_saved_items, save_item, unsave_item
+from app.utils.serialization import FastJSONResponse, FastJSONRoute
 
-router = APIRouter(prefix="/user", tags=["User"])
+router = APIRouter(prefix="/user", tags=["User"], route_class=FastJSONRoute)
 
 
 @router.get("/profile")
@@ -32,77 +35,79 @@ async def update_profile(data: dict, current_user: dict = Depends(get_current_us
     return {"success": True, "message": "Profile updated"}
 
 
+def _saved_page(result: dict):
+    """Return a saved-items page as a plain array, with the next cursor in a header"""
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    headers = {"X-Next-Cursor": result["next_cursor"]} if result["next_cursor"] else None
+    return FastJSONResponse(content=result["items"], headers=headers)
+
+
+@router.get("/saved/counts")
+async def get_saved_item_counts(current_user: dict = Depends(get_current_user)):
+    """Number of saved papers and questions"""
+    return await get_saved_counts(current_user["user_id"])
+
+
 @router.get("/saved/papers")
-async def get_saved_papers(current_user: dict = Depends(get_current_user)):
-    db = get_database()
-    users = db.users
-    papers = db.papers
-    user = await users.find_one({"_id": ObjectId(current_user["user_id"])})
-    saved_ids = user.get("saved_papers", []) if user else []
-    results = []
-    if saved_ids:
-        cursor = papers.find({"_id": {"$in": [ObjectId(pid) for pid in saved_ids]}})
-        async for p in cursor:
-            p["id"] = str(p.pop("_id"))
-            results.append(p)
-    return results
+async def get_saved_papers(
+    view: str = Query("summary", pattern="^(summary|full)$", description="Row shape: compact summary or full documents"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (overrides view)"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get saved papers, most recently saved first"""
+    try:
+        projection = paper_list_projection(view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await get_saved_items(current_user["user_id"], "paper", projection, cursor=cursor, limit=limit)
+    return _saved_page(result)
 
 
 @router.get("/saved/questions")
-async def get_saved_questions(current_user: dict = Depends(get_current_user)):
-    db = get_database()
-    users = db.users
-    questions = db.questions
-    user = await users.find_one({"_id": ObjectId(current_user["user_id"])})
-    saved_ids = user.get("saved_questions", []) if user else []
-    results = []
-    if saved_ids:
-        cursor = questions.find({"_id": {"$in": [ObjectId(qid) for qid in saved_ids]}})
-        async for q in cursor:
-            q["id"] = str(q.pop("_id"))
-            results.append(q)
-    return results
+async def get_saved_questions(
+    view: str = Query("summary", pattern="^(summary|full)$", description="Row shape: compact summary or full documents"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (overrides view)"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get saved questions, most recently saved first"""
+    try:
+        projection = question_list_projection(view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await get_saved_items(current_user["user_id"], "question", projection, cursor=cursor, limit=limit)
+    return _saved_page(result)
+
+
+async def _save(item_type: str, item_id: str, user_id: str, saved: bool):
+    if saved:
+        result = await save_item(user_id, item_type, item_id)
+    else:
+        result = await unsave_item(user_id, item_type, item_id)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return result
 
 
 @router.post("/saved/papers/{paper_id}")
 async def save_paper(paper_id: str, current_user: dict = Depends(get_current_user)):
-    db = get_database()
-    users = db.users
-    await users.update_one(
-        {"_id": ObjectId(current_user["user_id"])},
-        {"$addToSet": {"saved_papers": paper_id}}
-    )
-    return {"success": True, "message": "Paper saved"}
+    return await _save("paper", paper_id, current_user["user_id"], saved=True)
 
 
 @router.delete("/saved/papers/{paper_id}")
 async def unsave_paper(paper_id: str, current_user: dict = Depends(get_current_user)):
-    db = get_database()
-    users = db.users
-    await users.update_one(
-        {"_id": ObjectId(current_user["user_id"])},
-        {"$pull": {"saved_papers": paper_id}}
-    )
-    return {"success": True, "message": "Paper unsaved"}
+    return await _save("paper", paper_id, current_user["user_id"], saved=False)
 
 
 @router.post("/saved/questions/{question_id}")
 async def save_question(question_id: str, current_user: dict = Depends(get_current_user)):
-    db = get_database()
-    users = db.users
-    await users.update_one(
-        {"_id": ObjectId(current_user["user_id"])},
-        {"$addToSet": {"saved_questions": question_id}}
-    )
-    return {"success": True, "message": "Question saved"}
+    return await _save("question", question_id, current_user["user_id"], saved=True)
 
 
 @router.delete("/saved/questions/{question_id}")
 async def unsave_question(question_id: str, current_user: dict = Depends(get_current_user)):
-    db = get_database()
-    users = db.users
-    await users.update_one(
-        {"_id": ObjectId(current_user["user_id"])},
-        {"$pull": {"saved_questions": question_id}}
-    )
-    return {"success": True, "message": "Question unsaved"}
+    return await _save("question", question_id, current_user["user_id"], saved=False)
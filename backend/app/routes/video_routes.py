@@ -5,8 +5,9 @@ from app.utils.youtube_search import (
     search_videos_by_topic,
     get_video_details,
 )
+from app.utils.serialization import FastJSONRoute
 
-router = APIRouter(prefix="/videos", tags=["Videos"])
+router = APIRouter(prefix="/videos", tags=["Videos"], route_class=FastJSONRoute)
 
 
 @router.get("/search")
@@ -0,0 +1,57 @@
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from bson import ObjectId
+from app.utils.serialization import dumps
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 64 * 1024  # Bytes buffered before a chunk is sent
+
+
+def since_query(since: Optional[datetime]) -> dict:
+    """
+    Match documents created at or after since
+
+    ObjectIds embed their creation time, so this rides the _id index
+    instead of needing a created_at index on every exported collection.
+    """
+    if since is None:
+        return {}
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return {"_id": {"$gte": ObjectId.from_datetime(since)}}
+
+
+async def stream_ndjson(
+    collection,
+    query: dict,
+    projection: Optional[dict] = None,
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Stream matching documents as NDJSON, optionally gzipped
+
+    Documents are read from a Motor cursor in _id order and written out in
+    ~64 KB chunks, so memory stays flat however large the export is.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits=31: gzip container
+    cursor = collection.find(query, projection).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+    buffer = bytearray()
+    try:
+        async for document in cursor:
+            document["id"] = str(document.pop("_id"))
+            buffer += dumps(document)
+            buffer += b"\n"
+            if len(buffer) >= EXPORT_CHUNK_SIZE:
+                chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+                buffer.clear()
+                if chunk:
+                    yield chunk
+
+        chunk = bytes(buffer)
+        if compressor:
+            chunk = compressor.compress(chunk) + compressor.flush()
+        if chunk:
+            yield chunk
+    finally:
+        await cursor.close()
@@ -1,22 +1,97 @@
 import os
+import random
+import asyncio
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
-from typing import Optional
+from typing import AsyncIterator, Optional
+from app.utils.rate_limiter import AsyncRateLimiter
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_MODEL = "gemini-pro"
+GEMINI_VISION_MODEL = "gemini-pro-vision"
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", 60))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 4))
+GEMINI_RETRY_BASE_DELAY = 2.0
+
+# Errors that mean "slow down and try again" rather than a bad request
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable
+)
 
 # Configure Gemini API
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
+# Model objects are reusable; build each one once per process
+_models = {}
+_rate_limiter = AsyncRateLimiter(GEMINI_REQUESTS_PER_MINUTE, 60.0)
+
 
 def is_gemini_configured() -> bool:
     """Check if Gemini API is configured"""
     return bool(GEMINI_API_KEY)
 
 
+def get_model(model_name: str = GEMINI_MODEL) -> genai.GenerativeModel:
+    """Get a shared GenerativeModel instance"""
+    model = _models.get(model_name)
+    if model is None:
+        model = genai.GenerativeModel(model_name)
+        _models[model_name] = model
+    return model
+
+
+async def generate_content(model: genai.GenerativeModel, contents, **kwargs):
+    """
+    Call Gemini within the process-wide rate limit
+    
+    Quota and availability errors are retried with exponential backoff and
+    jitter; any other error is raised to the caller.
+    """
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        await _rate_limiter.acquire()
+        try:
+            return await model.generate_content_async(contents, **kwargs)
+        except RETRYABLE_ERRORS:
+            if attempt == GEMINI_MAX_RETRIES:
+                raise
+            delay = GEMINI_RETRY_BASE_DELAY * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+
+def build_solution_prompt(question_text: str, context: Optional[dict] = None) -> str:
+    """Build the tutoring prompt for a question"""
+    prompt = f"""You are an expert academic tutor helping students understand exam questions.
+
+Question: {question_text}
+"""
+    
+    if context:
+        if context.get("subject"):
+            prompt += f"\nSubject: {context['subject']}"
+        if context.get("marks"):
+            prompt += f"\nMarks: {context['marks']}"
+        if context.get("course"):
+            prompt += f"\nCourse: {context['course']}"
+    
+    prompt += """
+
+Please provide:
+1. A clear, step-by-step solution
+2. Key concepts involved
+3. Common mistakes to avoid
+4. Tips for exam preparation
+
+Format your response in a clear, structured manner suitable for students."""
+    
+    return prompt
+
+
 async def generate_ai_solution(question_text: str, context: Optional[dict] = None) -> dict:
     """
     Generate AI solution for a question using Google Gemini
@@ -35,35 +110,11 @@ async def generate_ai_solution(question_text: str, context: Optional[dict] = Non
         }
     
     try:
-        # Initialize the model
-        model = genai.GenerativeModel('gemini-pro')
+        model = get_model(GEMINI_MODEL)
+        prompt = build_solution_prompt(question_text, context)
         
-        # Build prompt with context
-        prompt = f"""You are an expert academic tutor helping students understand exam questions.
-
-Question: {question_text}
-"""
-        
-        if context:
-            if context.get("subject"):
-                prompt += f"\nSubject: {context['subject']}"
-            if context.get("marks"):
-                prompt += f"\nMarks: {context['marks']}"
-            if context.get("course"):
-                prompt += f"\nCourse: {context['course']}"
-        
-        prompt += """
-
-Please provide:
-1. A clear, step-by-step solution
-2. Key concepts involved
-3. Common mistakes to avoid
-4. Tips for exam preparation
-
-Format your response in a clear, structured manner suitable for students."""
-        
-        # Generate response
-        response = model.generate_content(prompt)
+        # Generate response without blocking the event loop
+        response = await generate_content(model, prompt)
         
         if not response or not response.text:
             return {
@@ -74,7 +125,7 @@ Format your response in a clear, structured manner suitable for students."""
         return {
             "success": True,
             "solution": response.text,
-            "model": "gemini-pro",
+            "model": GEMINI_MODEL,
             "metadata": {
                 "prompt_length": len(prompt),
                 "response_length": len(response.text)
@@ -88,6 +139,26 @@ Format your response in a clear, structured manner suitable for students."""
         }
 
 
+async def stream_ai_solution(question_text: str, context: Optional[dict] = None) -> AsyncIterator[str]:
+    """
+    Stream an AI solution from Gemini, yielding text chunks as they arrive
+    
+    The request itself goes through the rate limit and retry policy; errors
+    after the first chunk are raised to the caller.
+    
+    Args:
+        question_text: The question to solve
+        context: Optional context including subject, marks, etc.
+    """
+    model = get_model(GEMINI_MODEL)
+    prompt = build_solution_prompt(question_text, context)
+    
+    response = await generate_content(model, prompt, stream=True)
+    async for chunk in response:
+        if chunk.text:
+            yield chunk.text
+
+
 async def generate_solution_with_image(question_text: str, image_path: str, context: Optional[dict] = None) -> dict:
     """
     Generate AI solution for a question with an image using Gemini Pro Vision
@@ -109,8 +180,8 @@ async def generate_solution_with_image(question_text: str, image_path: str, cont
     try:
         from PIL import Image
         
-        # Initialize the vision model
-        model = genai.GenerativeModel('gemini-pro-vision')
+        # Get the vision model
+        model = get_model(GEMINI_VISION_MODEL)
         
         # Load image
         img = Image.open(image_path)
@@ -129,7 +200,7 @@ Please provide:
 Format your response clearly for students."""
         
         # Generate response with image
-        response = model.generate_content([prompt, img])
+        response = await generate_content(model, [prompt, img])
         
         if not response or not response.text:
             return {
@@ -140,7 +211,7 @@ Format your response clearly for students."""
         return {
             "success": True,
             "solution": response.text,
-            "model": "gemini-pro-vision",
+            "model": GEMINI_VISION_MODEL,
             "has_image_analysis": True
         }
     
@@ -169,7 +240,7 @@ async def summarize_paper(paper_text: str, metadata: dict) -> dict:
         }
     
     try:
-        model = genai.GenerativeModel('gemini-pro')
+        model = get_model(GEMINI_MODEL)
         
         prompt = f"""Analyze this exam paper and provide a brief summary:
 
@@ -187,7 +258,7 @@ Please provide:
 
 Keep it concise (200-300 words)."""
         
-        response = model.generate_content(prompt)
+        response = await generate_content(model, prompt)
         
         if not response or not response.text:
             return {
@@ -198,7 +269,7 @@ Keep it concise (200-300 words)."""
         return {
             "success": True,
             "summary": response.text,
-            "model": "gemini-pro"
+            "model": GEMINI_MODEL
         }
     
     except Exception as e:
@@ -227,7 +298,7 @@ async def explain_concept(concept: str, subject: str, level: str = "undergraduat
         }
     
     try:
-        model = genai.GenerativeModel('gemini-pro')
+        model = get_model(GEMINI_MODEL)
         
         prompt = f"""Explain the following concept for {level} {subject} students:
 
@@ -242,7 +313,7 @@ Please provide:
 
 Use simple language and analogies where helpful."""
         
-        response = model.generate_content(prompt)
+        response = await generate_content(model, prompt)
         
         if not response or not response.text:
             return {
@@ -0,0 +1,250 @@
+import os
+import uuid
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+from pymongo import ReturnDocument
+from dotenv import load_dotenv
+from app.config.database import get_database
+
+load_dotenv()
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 2))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 600))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 2))
+JOB_RETRY_BASE_DELAY = int(os.getenv("JOB_RETRY_BASE_DELAY", 30))
+
+JobHandler = Callable[[dict], Awaitable[dict]]
+
+_handlers: Dict[str, JobHandler] = {}
+_workers = []
+_wakeup: Optional[asyncio.Event] = None
+_worker_id = uuid.uuid4().hex[:12]
+
+
+def register_job_handler(job_type: str, handler: JobHandler):
+    """Register the coroutine that processes jobs of a given type"""
+    _handlers[job_type] = handler
+
+
+async def enqueue_job(job_type: str, payload: dict, max_attempts: int = JOB_MAX_ATTEMPTS) -> dict:
+    """
+    Persist a new job and wake up the local worker pool
+
+    Args:
+        job_type: Handler name registered with register_job_handler
+        payload: JSON-serializable job arguments (paper_id is indexed for lookups)
+        max_attempts: Number of tries before the job is marked failed
+
+    Returns:
+        The stored job document
+    """
+    db = get_database()
+    now = datetime.utcnow()
+    job = {
+        "type": job_type,
+        "paper_id": payload.get("paper_id"),
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_after": now,
+        "locked_until": None,
+        "worker_id": None,
+        "progress": {},
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now
+    }
+    result = await db.jobs.insert_one(job)
+    job["_id"] = result.inserted_id
+
+    if _wakeup is not None:
+        _wakeup.set()
+
+    return job
+
+
+async def claim_job() -> Optional[dict]:
+    """
+    Atomically claim the next runnable job.
+
+    A job is runnable when it is queued and due, or when a previous worker's
+    lease expired while it was running (the worker crashed or was restarted).
+    """
+    db = get_database()
+    now = datetime.utcnow()
+    return await db.jobs.find_one_and_update(
+        {
+            "type": {"$in": list(_handlers.keys())},
+            "$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {"status": "running", "locked_until": {"$lt": now}}
+            ]
+        },
+        {
+            "$set": {
+                "status": "running",
+                "worker_id": _worker_id,
+                "locked_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                "started_at": now,
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def update_job_progress(job_id, progress: dict):
+    """Record handler progress and extend the job lease"""
+    db = get_database()
+    now = datetime.utcnow()
+    await db.jobs.update_one(
+        {"_id": job_id},
+        {
+            "$set": {
+                "progress": progress,
+                "locked_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                "updated_at": now
+            }
+        }
+    )
+
+
+async def complete_job(job: dict, result: dict):
+    """Mark a job as succeeded"""
+    db = get_database()
+    await db.jobs.update_one(
+        {"_id": job["_id"]},
+        {
+            "$set": {
+                "status": "succeeded",
+                "result": result,
+                "error": None,
+                "locked_until": None,
+                "finished_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            }
+        }
+    )
+
+
+async def fail_job(job: dict, error: str):
+    """Schedule a retry with exponential backoff, or mark the job failed"""
+    db = get_database()
+    now = datetime.utcnow()
+
+    if job["attempts"] < job.get("max_attempts", JOB_MAX_ATTEMPTS):
+        delay = JOB_RETRY_BASE_DELAY * (2 ** (job["attempts"] - 1))
+        update = {
+            "status": "queued",
+            "run_after": now + timedelta(seconds=delay),
+            "locked_until": None,
+            "error": error,
+            "updated_at": now
+        }
+    else:
+        update = {
+            "status": "failed",
+            "locked_until": None,
+            "error": error,
+            "finished_at": now,
+            "updated_at": now
+        }
+
+    await db.jobs.update_one({"_id": job["_id"]}, {"$set": update})
+
+
+async def get_latest_job(job_type: str, paper_id: str) -> Optional[dict]:
+    """Get the most recent job of a type for a paper"""
+    db = get_database()
+    return await db.jobs.find_one(
+        {"type": job_type, "paper_id": paper_id},
+        sort=[("created_at", -1)]
+    )
+
+
+def serialize_job(job: dict) -> dict:
+    """Convert a job document into an API response"""
+    return {
+        "id": str(job["_id"]),
+        "type": job["type"],
+        "paper_id": job.get("paper_id"),
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "max_attempts": job.get("max_attempts", JOB_MAX_ATTEMPTS),
+        "progress": job.get("progress") or {},
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "run_after": job.get("run_after"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+        "finished_at": job.get("finished_at")
+    }
+
+
+async def _run_job(job: dict):
+    """Dispatch a claimed job to its handler and record the outcome"""
+    handler = _handlers.get(job["type"])
+    try:
+        result = await handler(job)
+    except asyncio.CancelledError:
+        # Shutting down: hand the job back so another worker picks it up
+        db = get_database()
+        await db.jobs.update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": "queued", "locked_until": None}, "$inc": {"attempts": -1}}
+        )
+        raise
+    except Exception as e:
+        print(f"Job {job['_id']} ({job['type']}) failed: {e}")
+        await fail_job(job, str(e))
+        return
+
+    if result.get("success", True):
+        await complete_job(job, result)
+    else:
+        await fail_job(job, result.get("message") or result.get("error") or "Job failed")
+
+
+async def _worker_loop():
+    """Claim and run jobs until cancelled"""
+    while True:
+        try:
+            job = await claim_job()
+        except Exception as e:
+            print(f"Job worker error: {e}")
+            job = None
+
+        if job:
+            await _run_job(job)
+            continue
+
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start_job_workers(concurrency: int = JOB_WORKER_CONCURRENCY):
+    """Start the background worker pool (at most `concurrency` jobs run at once)"""
+    global _wakeup
+    if _workers:
+        return
+    _wakeup = asyncio.Event()
+    for _ in range(concurrency):
+        _workers.append(asyncio.create_task(_worker_loop()))
+    print(f"Started {concurrency} job workers ({_worker_id})")
+
+
+async def stop_job_workers():
+    """Cancel the worker pool, requeueing any in-flight jobs"""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
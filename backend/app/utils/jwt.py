@@ -1,3 +1,5 @@
+import time
+import hashlib
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -5,6 +7,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 from dotenv import load_dotenv
+from app.utils.ttl_cache import TTLCache
 
 load_dotenv()
 
@@ -14,6 +17,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
 security = HTTPBearer()
 
+# Verified claims keyed by token digest; each entry expires with its token
+_verified_tokens = TTLCache(maxsize=int(os.getenv("JWT_CACHE_SIZE", 10000)), ttl=0)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -28,34 +34,57 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Verify JWT token"""
-    token = credentials.credentials
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims, reusing earlier verifications
+    
+    Only successfully verified tokens are cached, under a SHA-256 digest of
+    the token, and only until the token's exp, so an expired token is
+    always decoded (and rejected) again.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(key)
+    if payload is not None:
+        return payload
     
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    
+    if payload.get("exp") is not None:
+        _verified_tokens.set(key, payload, ttl=payload["exp"] - time.time())
+    return payload
 
 
-def get_current_user(token_data: dict = Depends(verify_token)):
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Verify JWT token (async so the claims cache is only touched from the event loop)"""
+    return decode_access_token(credentials.credentials)
+
+
+async def get_current_user(token_data: dict = Depends(verify_token)):
     """Get current user from token"""
     return token_data
 
 
+def get_token_cache_stats() -> dict:
+    """Claims cache statistics for the admin metrics endpoint"""
+    return _verified_tokens.stats()
+
+
 def require_role(allowed_roles: list):
     """Dependency to check user role"""
-    def role_checker(token_data: dict = Depends(verify_token)):
+    async def role_checker(token_data: dict = Depends(verify_token)):
         user_role = token_data.get("role")
         if user_role not in allowed_roles:
             raise HTTPException(
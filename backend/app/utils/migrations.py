@@ -0,0 +1,68 @@
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+from dotenv import load_dotenv
+from pymongo.errors import DuplicateKeyError
+from app.config.database import get_database
+
+load_dotenv()
+
+# How long a claimed migration stays locked before another startup may retake it
+MIGRATION_LEASE_SECONDS = int(os.getenv("MIGRATION_LEASE_SECONDS", 600))
+
+
+async def _claim_migration(db, name: str) -> bool:
+    """Claim the marker for a migration that has not completed and is not locked"""
+    now = datetime.utcnow()
+    locked_until = now + timedelta(seconds=MIGRATION_LEASE_SECONDS)
+    try:
+        await db.migrations.insert_one({"_id": name, "started_at": now, "locked_until": locked_until})
+        return True
+    except DuplicateKeyError:
+        pass
+
+    # The marker exists: retake it only if unfinished and its lease ran out
+    # (the process that claimed it was killed before it could finish)
+    result = await db.migrations.update_one(
+        {
+            "_id": name,
+            "completed_at": {"$exists": False},
+            "$or": [{"locked_until": {"$lt": now}}, {"locked_until": {"$exists": False}}]
+        },
+        {"$set": {"started_at": now, "locked_until": locked_until}}
+    )
+    return result.modified_count == 1
+
+
+async def run_migration_once(name: str, fn: Callable[[], Awaitable[Any]]):
+    """
+    Run a data migration at most once per database
+
+    A marker document in the migrations collection is claimed before fn
+    runs, so overlapping startups (e.g. a rolling deploy) never run the
+    same migration twice, and finished migrations cost one _id lookup on
+    later startups. The claim is a lease of MIGRATION_LEASE_SECONDS: if the
+    process dies mid-migration, a later startup retakes the marker once it
+    expires. If fn raises, the marker is removed and the migration is
+    retried on the next startup.
+    """
+    db = get_database()
+    try:
+        if not await _claim_migration(db, name):
+            return None  # Finished, or running in another process
+    except Exception as e:
+        print(f"Could not start migration {name}: {e}")
+        return None
+
+    try:
+        result = await fn()
+    except Exception as e:
+        print(f"Migration {name} failed, will retry on next startup: {e}")
+        await db.migrations.delete_one({"_id": name})
+        return None
+
+    await db.migrations.update_one(
+        {"_id": name},
+        {"$set": {"completed_at": datetime.utcnow(), "result": result}, "$unset": {"locked_until": ""}}
+    )
+    return result
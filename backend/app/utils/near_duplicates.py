@@ -0,0 +1,186 @@
+import random
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import List, Optional, Tuple
+from pymongo import UpdateOne
+from app.config.database import get_database
+from app.utils.solution_cache import normalize_question_text
+from app.utils.ocr_extractor import PDF_EXTRACT_WORKERS, run_in_process_pool
+
+# 64 MinHash permutations split into 16 bands of 4 rows: questions whose
+# shingle sets have Jaccard similarity around 0.5 or more collide in at least
+# one band with high probability, while unrelated questions almost never do.
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 5  # Characters; robust to small wording changes in short questions
+SIMILARITY_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # Fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingle_question(text: str) -> set:
+    """Character n-gram shingles of normalized question text"""
+    normalized = normalize_question_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """MinHash signature of a question, or None if it has no words"""
+    hashes = [_hash64(shingle) for shingle in shingle_question(text)]
+    if not hashes:
+        return None
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def lsh_band_keys(signature: List[int]) -> List[str]:
+    """Bucket keys, one per band; near-duplicates share at least one"""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(",".join(map(str, rows)).encode(), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def signatures_with_bands(texts: List[str]) -> List[Optional[Tuple[List[int], List[str]]]]:
+    """Signature and band keys for each text, None where a text has no words (runs in a worker process)"""
+    results = []
+    for text in texts:
+        signature = minhash_signature(text)
+        results.append((signature, lsh_band_keys(signature)) if signature else None)
+    return results
+
+
+async def compute_signatures(texts: List[str]) -> List[Optional[Tuple[List[int], List[str]]]]:
+    """
+    signatures_with_bands for many texts, split across the process pool
+
+    MinHash is pure-Python CPU work (~4 ms per question), so it must not
+    run on the event loop.
+    """
+    if not texts:
+        return []
+    chunk_size = -(-len(texts) // PDF_EXTRACT_WORKERS)
+    chunks = await asyncio.gather(*(
+        run_in_process_pool(signatures_with_bands, texts[start:start + chunk_size])
+        for start in range(0, len(texts), chunk_size)
+    ))
+    return [result for chunk in chunks for result in chunk]
+
+
+def estimate_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+
+async def link_near_duplicates(question_docs: List[dict], paper: dict) -> int:
+    """
+    Assign newly inserted questions to near-duplicate clusters
+
+    Candidates are found through the multikey index on LSH band keys, so the
+    lookup touches only questions sharing a bucket, never the whole corpus.
+
+    Args:
+        question_docs: Inserted question documents (with _id and question_text)
+        paper: The paper the questions belong to (for year/exam_type)
+
+    Returns:
+        Number of questions linked to an existing cluster
+    """
+    db = get_database()
+    signatures_collection = db.question_signatures
+
+    signatures = await compute_signatures([doc["question_text"] for doc in question_docs])
+    entries = [
+        (doc, *result)
+        for doc, result in zip(question_docs, signatures)
+        if result is not None
+    ]
+    if not entries:
+        return 0
+
+    all_bands = list({band for _, _, bands in entries for band in bands})
+    candidates = [
+        candidate async for candidate in signatures_collection.find(
+            {"bands": {"$in": all_bands}, "paper_id": {"$ne": str(paper["_id"])}},
+            {"signature": 1, "bands": 1, "cluster_id": 1}
+        )
+    ]
+
+    signature_docs = []
+    question_updates = []
+    linked = 0
+    for doc, signature, bands in entries:
+        band_set = set(bands)
+        best, best_similarity = None, SIMILARITY_THRESHOLD
+        for candidate in candidates:
+            if band_set.isdisjoint(candidate["bands"]):
+                continue
+            similarity = estimate_similarity(signature, candidate["signature"])
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+
+        cluster_id = best["cluster_id"] if best else doc["_id"]
+        if best:
+            linked += 1
+            question_updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"duplicate_cluster_id": cluster_id}}))
+
+        signature_docs.append({
+            "_id": doc["_id"],
+            "paper_id": str(paper["_id"]),
+            "year": paper.get("year"),
+            "exam_type": paper.get("exam_type"),
+            "signature": signature,
+            "bands": bands,
+            "cluster_id": cluster_id,
+            "created_at": datetime.utcnow()
+        })
+
+    await signatures_collection.insert_many(signature_docs, ordered=False)
+    if question_updates:
+        await db.questions.bulk_write(question_updates, ordered=False)
+
+    return linked
+
+
+async def get_also_asked_in(question_id, cluster_id, limit: int = 20) -> List[dict]:
+    """Other papers in which a near-duplicate of the question appeared"""
+    db = get_database()
+    cursor = db.question_signatures.find(
+        {"cluster_id": cluster_id, "_id": {"$ne": question_id}},
+        {"paper_id": 1, "year": 1, "exam_type": 1}
+    ).limit(limit)
+
+    occurrences = []
+    async for entry in cursor:
+        occurrences.append({
+            "question_id": str(entry["_id"]),
+            "paper_id": entry.get("paper_id"),
+            "year": entry.get("year"),
+            "exam_type": entry.get("exam_type")
+        })
+    occurrences.sort(key=lambda o: str(o["year"] or ""))
+    return occurrences
+
+
+async def delete_paper_signatures(paper_id: str):
+    """Remove signatures of a paper's questions"""
+    db = get_database()
+    await db.question_signatures.delete_many({"paper_id": paper_id})
@@ -1,36 +1,135 @@
 import os
 import re
+import time
+import asyncio
 import requests
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from PyPDF2 import PdfReader
 from dotenv import load_dotenv
 
 load_dotenv()
 
 OCR_SPACE_API_KEY = os.getenv("OCR_SPACE_API_KEY", "")
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", os.cpu_count() or 2))
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", 120))
+PDF_MIN_PAGES_PER_CHUNK = 4
+
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+
+# Cumulative throughput of the parallel extractor
+_extraction_stats = {
+    "documents": 0,
+    "pages": 0,
+    "seconds": 0.0,
+    "timeouts": 0,
+    "errors": 0,
+    "last_pages_per_second": 0.0
+}
 
 
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from PDF using PyPDF2"""
     try:
         reader = PdfReader(file_path)
-        text = ""
-        
-        for page in reader.pages:
-            text += page.extract_text() + "\n\n"
-        
-        return text.strip()
+        return "\n\n".join(page.extract_text() for page in reader.pages).strip()
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return ""
 
 
-def extract_text_with_ocr(file_path: str) -> str:
+def _count_pdf_pages(file_path: str) -> int:
+    """Count pages in a PDF (runs in a worker process)"""
+    return len(PdfReader(file_path).pages)
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract text for pages [start, stop) of a PDF (runs in a worker process)"""
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Lazily create the shared PDF extraction process pool"""
+    global _pdf_executor
+    if _pdf_executor is None:
+        _pdf_executor = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+    return _pdf_executor
+
+
+def shutdown_pdf_executor():
+    """Shut down the PDF extraction process pool"""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(wait=False, cancel_futures=True)
+        _pdf_executor = None
+
+
+async def run_in_process_pool(fn, *args):
+    """Run a picklable CPU-bound function on the shared process pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pdf_executor(), fn, *args)
+
+
+def get_extraction_stats() -> dict:
+    """Get throughput metrics for parallel PDF extraction"""
+    stats = dict(_extraction_stats)
+    stats["pages_per_second"] = round(stats["pages"] / stats["seconds"], 2) if stats["seconds"] else 0.0
+    return stats
+
+
+async def extract_text_from_pdf_parallel(file_path: str, timeout: float = PDF_EXTRACT_TIMEOUT) -> str:
+    """
+    Extract text from PDF by fanning page ranges out across a process pool
+    
+    Args:
+        file_path: Path to the PDF file
+        timeout: Maximum seconds to spend on the whole document
+    
+    Returns:
+        Page texts merged in page order, or "" on error/timeout
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_pdf_executor()
+    started = time.perf_counter()
+    
+    async def extract() -> tuple:
+        page_count = await loop.run_in_executor(executor, _count_pdf_pages, file_path)
+        chunk_size = max(PDF_MIN_PAGES_PER_CHUNK, -(-page_count // PDF_EXTRACT_WORKERS))
+        futures = [
+            loop.run_in_executor(executor, _extract_page_range, file_path, start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)
+        ]
+        # gather preserves submission order, so chunks come back in page order
+        chunks = await asyncio.gather(*futures)
+        return page_count, [page for chunk in chunks for page in chunk]
+    
+    try:
+        page_count, pages = await asyncio.wait_for(extract(), timeout=timeout)
+    except asyncio.TimeoutError:
+        _extraction_stats["timeouts"] += 1
+        print(f"PDF extraction timed out after {timeout}s: {file_path}")
+        return ""
+    except Exception as e:
+        _extraction_stats["errors"] += 1
+        print(f"Error extracting text from PDF: {e}")
+        return ""
+    
+    elapsed = time.perf_counter() - started
+    _extraction_stats["documents"] += 1
+    _extraction_stats["pages"] += page_count
+    _extraction_stats["seconds"] += elapsed
+    _extraction_stats["last_pages_per_second"] = round(page_count / elapsed, 2) if elapsed else 0.0
+    
+    return "\n\n".join(pages).strip()
+
+
+def extract_text_with_ocr(file_path: str, fallback: bool = True) -> str:
     """Extract text from PDF using OCR.space API (for scanned PDFs)"""
     if not OCR_SPACE_API_KEY:
         print("OCR_SPACE_API_KEY not set. Using PyPDF2 only.")
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path) if fallback else ""
     
     try:
         with open(file_path, 'rb') as f:
@@ -53,58 +152,84 @@ def extract_text_with_ocr(file_path: str) -> str:
         
         if result.get('IsErroredOnProcessing'):
             print(f"OCR error: {result.get('ErrorMessage')}")
-            return extract_text_from_pdf(file_path)
+            return extract_text_from_pdf(file_path) if fallback else ""
         
         # Combine text from all pages
-        text = ""
-        if 'ParsedResults' in result:
-            for page_result in result['ParsedResults']:
-                text += page_result.get('ParsedText', '') + "\n\n"
-        
-        return text.strip()
+        pages = [page_result.get('ParsedText', '') for page_result in result.get('ParsedResults', [])]
+        return "\n\n".join(pages).strip()
     except Exception as e:
         print(f"OCR API error: {e}. Falling back to PyPDF2")
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path) if fallback else ""
+
+
+# One alternation covers every question marker style plus the marks
+# annotations, so the text is scanned exactly once.
+QUESTION_MARKER_KINDS = ("q", "question", "numbered")  # Preference order
+
+_SEGMENT_RE = re.compile(
+    r'(?=[\[(\dQq])(?:'                                           # Cheap first-character filter
+    r'(?P<question>\bQuestion\s*(?P<question_num>\d+)[.):]?)'     # Question 1.
+    r'|(?P<q>(?<![a-z])Q\.?\s*(?P<q_num>\d+)[.):]?)'              # Q1. or Q.1 or Q1:
+    r'|(?P<numbered>(?<![\w.])(?P<numbered_num>\d+)[.)]\s+)'       # 1. or 1)
+    r'|\[(?P<marks_sq>\d+)\s*marks?\]'                            # [5 marks]
+    r'|\((?P<marks_paren>\d+)\s*marks?\))',                       # (5 marks)
+    re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _scan_question_segments(text: str) -> Dict[str, List[list]]:
+    """
+    Find question boundaries for every marker style in a single scan
+    
+    Returns:
+        Mapping of marker kind to segments of [number, start, end, marks]
+    """
+    segments = {kind: [] for kind in QUESTION_MARKER_KINDS}
+    
+    for match in _SEGMENT_RE.finditer(text):
+        kind = match.lastgroup
+        
+        if kind.startswith("marks_"):
+            # Attach to the open segment of each kind that has no marks yet
+            marks = int(match.group(kind))
+            for kind_segments in segments.values():
+                if kind_segments and kind_segments[-1][3] is None:
+                    kind_segments[-1][3] = marks
+            continue
+        
+        kind_segments = segments[kind]
+        if kind_segments:
+            kind_segments[-1][2] = match.start()
+        kind_segments.append([int(match.group(f"{kind}_num")), match.end(), len(text), None])
+    
+    return segments
 
 
 def parse_questions_from_text(text: str) -> List[Dict]:
     """Parse questions from extracted text"""
     questions = []
+    segments = _scan_question_segments(text)
     
-    # Common question patterns
-    patterns = [
-        r'Q\.?\s*(\d+)[\.\):]?\s*(.*?)(?=Q\.?\s*\d+|$)',  # Q1. or Q.1 or Q1:
-        r'Question\s*(\d+)[\.\):]?\s*(.*?)(?=Question\s*\d+|$)',  # Question 1.
-        r'(\d+)[\.\)]\s+(.*?)(?=\d+[\.\)]|$)',  # 1. or 1)
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-        for match in matches:
-            question_num = match.group(1)
-            question_text = match.group(2).strip()
+    # Use the first marker style that yields real questions
+    for kind in QUESTION_MARKER_KINDS:
+        for question_num, start, end, marks in segments[kind]:
+            question_text = text[start:end].strip()
             
             # Skip if question text is too short (likely not a real question)
             if len(question_text) < 10:
                 continue
             
             # Clean up the text
-            question_text = re.sub(r'\s+', ' ', question_text)  # Remove extra whitespace
+            question_text = _WHITESPACE_RE.sub(' ', question_text)  # Remove extra whitespace
             question_text = question_text[:5000]  # Limit length
             
-            # Extract marks if present
-            marks_match = re.search(r'\[(\d+)\s*marks?\]|\((\d+)\s*marks?\)', question_text, re.IGNORECASE)
-            marks = None
-            if marks_match:
-                marks = int(marks_match.group(1) or marks_match.group(2))
-            
             questions.append({
-                "question_number": int(question_num),
+                "question_number": question_num,
                 "question_text": question_text,
                 "marks": marks
             })
         
-        # If we found questions with this pattern, use them
         if questions:
             break
     
@@ -161,11 +286,13 @@ def extract_metadata_from_text(text: str) -> Dict:
 async def process_paper_pdf(file_path: str, use_ocr: bool = True) -> Dict:
     """Process a paper PDF and extract questions"""
     try:
-        # Extract text
+        # Extract text off the event loop: OCR.space is a blocking HTTP call,
+        # PyPDF2 parsing is CPU-bound and fanned out across processes
+        text = ""
         if use_ocr and OCR_SPACE_API_KEY:
-            text = extract_text_with_ocr(file_path)
-        else:
-            text = extract_text_from_pdf(file_path)
+            text = await asyncio.to_thread(extract_text_with_ocr, file_path, False)
+        if not text:
+            text = await extract_text_from_pdf_parallel(file_path)
         
         if not text:
             return {
@@ -0,0 +1,37 @@
+import json
+import base64
+from datetime import datetime
+from bson import ObjectId
+
+
+def encode_cursor(document: dict, field: str = "created_at") -> str:
+    """Encode the (field, _id) position of a document as an opaque cursor"""
+    position = {"t": document[field].isoformat(), "id": str(document["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor back into (datetime, ObjectId); raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(position["t"]), ObjectId(position["id"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_query(query: dict, cursor: str, field: str = "created_at") -> dict:
+    """
+    Restrict a query to documents after a cursor, for a (field, _id) descending sort
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    value, last_id = decode_cursor(cursor)
+    return {
+        **query,
+        "$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": last_id}}
+        ]
+    }
@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Dict, Optional
+from app.config.database import get_database
+
+# Browse dimensions, in the order used for facet document keys
+FACET_FIELDS = ("college", "course", "subject", "year", "exam_type")
+
+
+def normalize_year(year) -> Optional[str]:
+    """
+    Papers store year as a string
+
+    /upload receives it as an int and JSON bodies as a str; facet keys and
+    filters match by type, so every write and query goes through this.
+    """
+    if year is None:
+        return None
+    return str(year).strip()
+
+
+def facet_key(paper: dict) -> dict:
+    """The facet combination a paper belongs to"""
+    key = {field: paper.get(field) for field in FACET_FIELDS}
+    key["year"] = normalize_year(key["year"])
+    return key
+
+
+async def increment_paper_facets(paper: dict, delta: int = 1):
+    """
+    Adjust the count of a paper's facet combination
+
+    Called whenever a paper is created, deleted or has a facet field changed,
+    so facet counts never need an aggregation over papers at request time.
+    """
+    db = get_database()
+    key = facet_key(paper)
+    await db.paper_facets.update_one(
+        {"_id": key},
+        {
+            "$inc": {"count": delta},
+            "$set": {**key, "updated_at": datetime.utcnow()}
+        },
+        upsert=True
+    )
+    if delta < 0:
+        await db.paper_facets.delete_one({"_id": key, "count": {"$lte": 0}})
+
+
+async def get_paper_facets(filters: Optional[dict] = None) -> Dict[str, list]:
+    """
+    Get value counts for every browse dimension under the given filters
+
+    Each dimension is counted with every filter applied except its own, so
+    a dropdown keeps showing the alternatives to its current selection.
+    """
+    db = get_database()
+    filters = {k: v for k, v in (filters or {}).items() if k in FACET_FIELDS and v is not None}
+
+    # One query covers every "all filters except one dimension" combination
+    if filters:
+        query = {"$or": [
+            {k: v for k, v in filters.items() if k != field}
+            for field in FACET_FIELDS
+        ]}
+    else:
+        query = {}
+
+    counts = {field: {} for field in FACET_FIELDS}
+    async for doc in db.paper_facets.find(query, {"_id": 0, "count": 1, **{f: 1 for f in FACET_FIELDS}}):
+        for field in FACET_FIELDS:
+            if all(doc.get(k) == v for k, v in filters.items() if k != field):
+                value = doc.get(field)
+                counts[field][value] = counts[field].get(value, 0) + doc["count"]
+
+    return {
+        field: sorted(
+            ({"value": value, "count": count} for value, count in values.items() if value is not None),
+            key=lambda item: (-item["count"], str(item["value"]))
+        )
+        for field, values in counts.items()
+    }
+
+
+async def rebuild_paper_facets() -> int:
+    """Recompute the facet collection from papers (maintenance only)"""
+    db = get_database()
+    pipeline = [
+        {"$group": {"_id": {field: f"${field}" for field in FACET_FIELDS}, "count": {"$sum": 1}}},
+    ]
+    # Groups that differ only by year type collapse into one combination
+    counts = {}
+    async for group in db.papers.aggregate(pipeline):
+        key = tuple(facet_key(group["_id"]).items())
+        counts[key] = counts.get(key, 0) + group["count"]
+    facets = []
+    for items, count in counts.items():
+        key = dict(items)
+        facets.append({"_id": key, **key, "count": count, "updated_at": datetime.utcnow()})
+
+    await db.paper_facets.delete_many({})
+    if facets:
+        await db.paper_facets.insert_many(facets)
+    return len(facets)
+
+
+async def normalize_paper_years() -> int:
+    """Convert numeric paper years to strings and rebuild facets (one-time migration)"""
+    db = get_database()
+    result = await db.papers.update_many(
+        {"year": {"$type": "number"}},
+        [{"$set": {"year": {"$toString": "$year"}}}]
+    )
+    if result.modified_count:
+        await rebuild_paper_facets()
+        print(f"Converted the year of {result.modified_count} papers to a string")
+    return result.modified_count
+
+
+async def ensure_paper_facets():
+    """Build the facet collection once if papers exist but facets were never materialized"""
+    db = get_database()
+    try:
+        if await db.paper_facets.find_one({}, {"_id": 1}):
+            return
+        if await db.papers.find_one({}, {"_id": 1}):
+            combinations = await rebuild_paper_facets()
+            print(f"Materialized {combinations} paper facet combinations")
+    except Exception as e:
+        print(f"Could not materialize paper facets: {e}")
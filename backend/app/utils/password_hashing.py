@@ -0,0 +1,112 @@
+import os
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# bcrypt releases the GIL while hashing, so threads run it in parallel
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+# Password operations allowed to wait or run at once before new ones are shed
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", PASSWORD_HASH_WORKERS * 8))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", 2))
+
+_password_executor: Optional[ThreadPoolExecutor] = None
+_pending = 0
+
+_password_stats = {
+    "completed": 0,
+    "failed": 0,
+    "abandoned": 0,
+    "rejected": 0,
+    "max_pending_seen": 0
+}
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password executor's queue is full"""
+
+    def __init__(self, retry_after: int = PASSWORD_HASH_RETRY_AFTER):
+        super().__init__("Too many sign-in requests, please retry shortly")
+        self.retry_after = retry_after
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    """Lazily create the dedicated password hashing thread pool"""
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash"
+        )
+    return _password_executor
+
+
+def shutdown_password_executor():
+    """Shut down the password hashing thread pool"""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
+def _release_slot(future: Future):
+    """Free an admission slot once the executor is really done with the call"""
+    global _pending
+    _pending -= 1
+    if future.cancelled():
+        _password_stats["abandoned"] += 1
+    elif future.exception() is not None:
+        _password_stats["failed"] += 1
+    else:
+        _password_stats["completed"] += 1
+
+
+async def run_password_work(fn: Callable, *args):
+    """
+    Run a bcrypt hash or verify call on the password executor
+
+    Admission is bounded: once PASSWORD_HASH_MAX_PENDING calls are queued or
+    running, new calls fail fast with PasswordHashingBusy instead of piling
+    up behind seconds of CPU work. A slot is held until the executor
+    finishes the call, not until the request stops waiting: a client that
+    disconnects mid-hash does not free room while its bcrypt still runs.
+
+    Raises:
+        PasswordHashingBusy: If the queue is full
+    """
+    global _pending
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        _password_stats["rejected"] += 1
+        raise PasswordHashingBusy()
+
+    loop = asyncio.get_running_loop()
+    _pending += 1
+    _password_stats["max_pending_seen"] = max(_password_stats["max_pending_seen"], _pending)
+    try:
+        future = _get_password_executor().submit(fn, *args)
+    except Exception:
+        _pending -= 1
+        raise
+
+    def on_done(done: Future):
+        # Runs on the executor thread; admission state belongs to the event loop
+        try:
+            loop.call_soon_threadsafe(_release_slot, done)
+        except RuntimeError:
+            pass  # Loop already closed during shutdown
+
+    future.add_done_callback(on_done)
+    # Cancelling the await cancels a call still queued; a running one finishes
+    return await asyncio.wrap_future(future)
+
+
+def get_password_hashing_stats() -> dict:
+    """Queue metrics for the admin metrics endpoint"""
+    return {
+        **_password_stats,
+        "pending": _pending,
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_pending": PASSWORD_HASH_MAX_PENDING
+    }
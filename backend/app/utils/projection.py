@@ -0,0 +1,76 @@
+from typing import Optional
+
+LIST_VIEWS = ("summary", "full")
+
+# Fields a client may request through fields=
+PAPER_FIELDS = (
+    "subject", "college", "course", "semester", "year", "exam_type", "pdf_url",
+    "faculty_id", "faculty_name", "has_faculty_solution", "solution_url",
+    "question_count", "views", "created_at", "updated_at"
+)
+QUESTION_FIELDS = (
+    "question_number", "question_text", "paper_id", "subject", "marks", "source",
+    "faculty_solution", "ai_solution", "has_ai_solution", "video_links",
+    "has_video_solution", "tags", "upvotes", "downvotes", "views", "created_at"
+)
+
+# Compact shapes returned by list endpoints unless view=full or fields= is given
+PAPER_SUMMARY_FIELDS = (
+    "subject", "college", "course", "semester", "year", "exam_type", "pdf_url",
+    "faculty_name", "has_faculty_solution", "question_count", "views", "created_at"
+)
+QUESTION_SUMMARY_FIELDS = (
+    "question_number", "paper_id", "subject", "marks", "has_ai_solution",
+    "has_video_solution", "tags", "upvotes", "downvotes", "views"
+)
+QUESTION_PREVIEW_LENGTH = 300
+
+# Never sent in lists, even with view=full
+_EXCLUDED_FIELDS = {"reports": 0}
+
+
+def list_projection(view: str, fields: Optional[str], allowed: tuple, summary: tuple) -> dict:
+    """
+    Map a view / fields= request parameter to a MongoDB projection
+
+    fields= takes precedence over view. Returns an exclusion projection for
+    view=full, otherwise an inclusion projection.
+
+    Raises:
+        ValueError: If the view is unknown or a requested field is not allowed
+    """
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return {field: 1 for field in requested}
+    if view not in LIST_VIEWS:
+        raise ValueError(f"Unknown view: {view}")
+    if view == "full":
+        return dict(_EXCLUDED_FIELDS)
+    return {field: 1 for field in summary}
+
+
+def paper_list_projection(view: str = "summary", fields: Optional[str] = None) -> dict:
+    """Projection for paper lists; created_at is always kept for cursors"""
+    projection = list_projection(view, fields, PAPER_FIELDS, PAPER_SUMMARY_FIELDS)
+    if fields:
+        projection["created_at"] = 1
+    return projection
+
+
+def question_list_projection(view: str = "summary", fields: Optional[str] = None) -> dict:
+    """
+    Projection for question lists
+
+    The summary view carries a question_text preview cut server-side with
+    $substrCP, plus text_truncated so clients know to fetch the full question.
+    Expression projections need an aggregation $project stage (or MongoDB 4.4+).
+    """
+    projection = list_projection(view, fields, QUESTION_FIELDS, QUESTION_SUMMARY_FIELDS)
+    if not fields and view == "summary":
+        text = {"$ifNull": ["$question_text", ""]}
+        projection["question_text"] = {"$substrCP": [text, 0, QUESTION_PREVIEW_LENGTH]}
+        projection["text_truncated"] = {"$gt": [{"$strLenCP": text}, QUESTION_PREVIEW_LENGTH]}
+    return projection
@@ -0,0 +1,32 @@
+import time
+import asyncio
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for coroutines
+
+    Allows `rate` acquisitions per `period` seconds on average, with bursts of
+    up to `rate`. Callers that exceed the budget sleep until a token frees up.
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.rate = max(1, rate)
+        self.period = period
+        self._tokens = float(self.rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+                self._refill()
+            self._tokens -= 1
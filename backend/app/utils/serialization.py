@@ -0,0 +1,69 @@
+import functools
+import inspect
+import orjson
+from typing import Any, Callable
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from pydantic import BaseModel
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any):
+    """Encode the types orjson does not know natively (Mongo and pydantic types)"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes; datetimes become ISO 8601 strings, ObjectIds plain strings"""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that renders plain return values with FastJSONResponse directly
+
+    FastAPI otherwise runs every returned dict through jsonable_encoder,
+    which walks the whole document in Python before it is encoded. Routes
+    with a response_model or return annotation keep FastAPI's validation.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_model = kwargs.get("response_model")
+        has_model = response_model is not None and not isinstance(response_model, DefaultPlaceholder)
+        has_annotation = inspect.signature(endpoint).return_annotation is not inspect.Signature.empty
+        if not has_model and not has_annotation:
+            endpoint = _render_with_orjson(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _render_with_orjson(endpoint: Callable, status_code: int = None) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            result = await endpoint(*args, **kwargs)
+        else:
+            result = await run_in_threadpool(endpoint, *args, **kwargs)
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(content=result, status_code=status_code or 200)
+    return wrapper
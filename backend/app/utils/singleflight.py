@@ -0,0 +1,89 @@
+import uuid
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict
+from pymongo.errors import DuplicateKeyError
+from app.config.database import get_database
+
+_inflight: Dict[str, asyncio.Future] = {}
+_owner_id = uuid.uuid4().hex
+
+
+class LeaderCancelled(Exception):
+    """The call a waiter was sharing was cancelled (e.g. its client disconnected)"""
+
+
+async def singleflight(key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fn at most once per key within this process
+
+    Concurrent callers with the same key share the result of the first call
+    instead of starting their own. If that call is cancelled, its waiters
+    are not: one of them runs fn itself and the rest share that call.
+    """
+    future = _inflight.get(key)
+    while future is not None:
+        try:
+            return await asyncio.shield(future)
+        except LeaderCancelled:
+            future = _inflight.get(key)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await fn()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        # Hand waiters an ordinary exception so they take over instead of failing
+        future.set_exception(LeaderCancelled())
+        future.exception()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a failure with no waiters is not logged as unhandled
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+async def acquire_lease(key: str, ttl_seconds: int) -> bool:
+    """
+    Try to take a cross-worker lease on key
+
+    Leases live in the generation_leases collection and expire after
+    ttl_seconds, so a crashed holder never blocks the key for good.
+
+    Returns:
+        True if this process now holds the lease
+    """
+    db = get_database()
+    now = datetime.utcnow()
+    lease = {"owner": _owner_id, "expires_at": now + timedelta(seconds=ttl_seconds)}
+
+    try:
+        await db.generation_leases.insert_one({"_id": key, **lease})
+        return True
+    except DuplicateKeyError:
+        result = await db.generation_leases.update_one(
+            {"_id": key, "expires_at": {"$lt": now}},
+            {"$set": lease}
+        )
+        return result.modified_count == 1
+
+
+async def release_lease(key: str):
+    """Release a lease held by this process"""
+    db = get_database()
+    await db.generation_leases.delete_one({"_id": key, "owner": _owner_id})
+
+
+async def is_lease_held(key: str) -> bool:
+    """Check whether any worker currently holds an unexpired lease on key"""
+    db = get_database()
+    lease = await db.generation_leases.find_one(
+        {"_id": key, "expires_at": {"$gte": datetime.utcnow()}},
+        {"_id": 1}
+    )
+    return lease is not None
@@ -0,0 +1,91 @@
+import re
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.config.database import get_database
+
+_MARKS_RE = re.compile(r'[\[(]\s*\d+\s*marks?\s*[\])]', re.IGNORECASE)
+_NON_WORD_RE = re.compile(r'[^\w\s]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Lookup counters since process start
+_cache_stats = {
+    "lookups": 0,
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "ingestion_fills": 0
+}
+
+
+def normalize_question_text(text: str) -> str:
+    """Normalize question text so trivially different copies hash the same"""
+    text = _MARKS_RE.sub(' ', text or '')
+    text = _NON_WORD_RE.sub(' ', text.lower())
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def solution_cache_key(question_text: str, subject: Optional[str], model: str) -> str:
+    """Content address of a solution: hash of normalized text, subject and model"""
+    parts = [model, normalize_question_text(subject or ''), normalize_question_text(question_text)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+async def get_cached_solution(key: str) -> Optional[dict]:
+    """Look up a shared solution by its content key"""
+    db = get_database()
+    entry = await db.ai_solution_cache.find_one({"_id": key}, {"ai_solution": 1})
+
+    _cache_stats["lookups"] += 1
+    if entry:
+        _cache_stats["hits"] += 1
+        return entry["ai_solution"]
+    _cache_stats["misses"] += 1
+    return None
+
+
+async def get_cached_solutions(keys: List[str]) -> Dict[str, dict]:
+    """Look up many shared solutions with one query"""
+    if not keys:
+        return {}
+
+    db = get_database()
+    unique_keys = list(set(keys))
+    cursor = db.ai_solution_cache.find({"_id": {"$in": unique_keys}}, {"ai_solution": 1})
+    found = {entry["_id"]: entry["ai_solution"] async for entry in cursor}
+
+    _cache_stats["lookups"] += len(keys)
+    hits = sum(1 for key in keys if key in found)
+    _cache_stats["hits"] += hits
+    _cache_stats["misses"] += len(keys) - hits
+    return found
+
+
+async def store_cached_solution(key: str, ai_solution: dict, question_text: str, subject: Optional[str]):
+    """Store a generated solution under its content key (first writer wins)"""
+    db = get_database()
+    await db.ai_solution_cache.update_one(
+        {"_id": key},
+        {
+            "$setOnInsert": {
+                "ai_solution": ai_solution,
+                "subject": subject,
+                "sample_text": question_text[:500],
+                "created_at": datetime.utcnow()
+            }
+        },
+        upsert=True
+    )
+    _cache_stats["stores"] += 1
+
+
+def record_ingestion_fills(count: int):
+    """Count questions that received a shared solution at ingestion"""
+    _cache_stats["ingestion_fills"] += count
+
+
+def get_cache_stats() -> dict:
+    """Get hit-rate metrics for the shared solution cache"""
+    stats = dict(_cache_stats)
+    stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+    return stats
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
+from app.config.database import get_database
+
+# Per-day event counters, one daily_stats document per UTC day
+DAILY_COUNTERS = ("signups", "uploads", "questions_extracted", "ai_generations", "video_fetches")
+# Running collection sizes kept in the single stats_totals document
+TOTAL_FIELDS = ("users", "papers", "questions")
+TOTALS_ID = "totals"
+
+
+def _day(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+
+async def record_stats(daily: Optional[dict] = None, totals: Optional[dict] = None):
+    """
+    Add to today's counters and the running totals
+
+    Called by the controllers as events happen, e.g.
+    record_stats({"signups": 1}, {"users": 1}), so analytics never has to
+    count or aggregate the source collections. Failures are logged and
+    swallowed: a missed increment must not fail the request that caused it.
+    """
+    daily = {k: v for k, v in (daily or {}).items() if v}
+    totals = {k: v for k, v in (totals or {}).items() if v}
+    db = get_database()
+    now = datetime.utcnow()
+    try:
+        if daily:
+            await db.daily_stats.update_one(
+                {"_id": _day(now)},
+                {"$inc": daily, "$set": {"updated_at": now}},
+                upsert=True
+            )
+        if totals:
+            await db.stats_totals.update_one(
+                {"_id": TOTALS_ID},
+                {"$inc": totals, "$set": {"updated_at": now}},
+                upsert=True
+            )
+    except Exception as e:
+        print(f"Could not record stats {daily} {totals}: {e}")
+
+
+async def get_stats_rollup(days: int = 30) -> dict:
+    """
+    Get running totals and per-day counters for the last `days` days
+
+    Reads the totals document and at most `days` daily documents by _id,
+    so the cost does not grow with the size of users, papers or questions.
+    Days without activity are filled with zeros.
+    """
+    db = get_database()
+    today = datetime.utcnow()
+    first_day = _day(today - timedelta(days=days - 1))
+
+    totals_doc = await db.stats_totals.find_one({"_id": TOTALS_ID}) or {}
+    by_day = {}
+    async for doc in db.daily_stats.find({"_id": {"$gte": first_day, "$lte": _day(today)}}):
+        by_day[doc["_id"]] = doc
+
+    daily = []
+    for offset in range(days - 1, -1, -1):
+        day = _day(today - timedelta(days=offset))
+        doc = by_day.get(day, {})
+        daily.append({"date": day, **{counter: doc.get(counter, 0) for counter in DAILY_COUNTERS}})
+
+    return {
+        "totals": {field: totals_doc.get(field, 0) for field in TOTAL_FIELDS},
+        "period": {counter: sum(day[counter] for day in daily) for counter in DAILY_COUNTERS},
+        "daily": daily,
+        "updated_at": totals_doc.get("updated_at")
+    }
+
+
+async def _count_totals(db) -> dict:
+    return {
+        "users": await db.users.count_documents({}),
+        "papers": await db.papers.count_documents({}),
+        "questions": await db.questions.count_documents({})
+    }
+
+
+async def rebuild_stats_totals() -> dict:
+    """
+    Recount the running totals from the source collections (maintenance only)
+
+    The stored totals are read before counting and the difference is
+    applied with $inc rather than a $set: a record_stats increment that
+    lands after the read is not part of the stored value the $inc
+    subtracts, so it survives the rebuild.
+    """
+    db = get_database()
+    stored = await db.stats_totals.find_one({"_id": TOTALS_ID}) or {}
+    totals = await _count_totals(db)
+    await db.stats_totals.update_one(
+        {"_id": TOTALS_ID},
+        {
+            "$inc": {field: totals[field] - stored.get(field, 0) for field in TOTAL_FIELDS},
+            "$set": {"updated_at": datetime.utcnow()}
+        },
+        upsert=True
+    )
+    return totals
+
+
+async def ensure_stats_totals():
+    """
+    Seed the running totals once if they were never materialized
+
+    Seeding is marked with seeded_at. As in rebuild_stats_totals, the
+    stored values are read before counting and the difference is applied
+    with $inc, so increments recorded before or during the seed are kept.
+    The seeded_at filter makes sure only one worker seeds.
+    """
+    db = get_database()
+    try:
+        stored = await db.stats_totals.find_one({"_id": TOTALS_ID}) or {}
+        if stored.get("seeded_at"):
+            return
+        totals = await _count_totals(db)
+        now = datetime.utcnow()
+        await db.stats_totals.update_one(
+            {"_id": TOTALS_ID, "seeded_at": {"$exists": False}},
+            {
+                "$inc": {field: totals[field] - stored.get(field, 0) for field in TOTAL_FIELDS},
+                "$set": {"seeded_at": now, "updated_at": now}
+            },
+            upsert=True
+        )
+        print(f"Materialized stats totals: {totals}")
+    except DuplicateKeyError:
+        pass  # Another worker seeded the totals first
+    except Exception as e:
+        print(f"Could not materialize stats totals: {e}")
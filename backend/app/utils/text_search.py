@@ -0,0 +1,60 @@
+import re
+import html
+from typing import List
+
+_TERM_RE = re.compile(r'\w+')
+
+# Words MongoDB's English text index ignores; never worth highlighting
+_STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "the", "to", "what", "with"
+}
+
+
+def search_terms(query: str) -> List[str]:
+    """Extract the distinct, non-trivial words of a search query"""
+    terms = []
+    for term in _TERM_RE.findall(query.lower()):
+        if len(term) > 1 and term not in _STOP_WORDS and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def _term_pattern(terms: List[str]):
+    """Match words that start with a term's stem (the text index stems words too)"""
+    stems = sorted({term[:max(4, len(term) - 2)] for term in terms}, key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(stem) for stem in stems) + r')\w*', re.IGNORECASE)
+
+
+def build_snippet(text: str, query: str, width: int = 200) -> str:
+    """
+    Build an HTML-escaped snippet around the first matching term
+
+    Matching words are wrapped in <mark> tags.
+    """
+    text = text or ""
+    terms = search_terms(query)
+    if not terms:
+        return html.escape(text[:width])
+
+    pattern = _term_pattern(terms)
+    first = pattern.search(text)
+    start = 0
+    if first and first.start() > width // 3:
+        start = text.rfind(" ", 0, first.start() - width // 3) + 1
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        if space > start:
+            end = space
+
+    window = text[start:end]
+    pieces = []
+    last = 0
+    for match in pattern.finditer(window):
+        pieces.append(html.escape(window[last:match.start()]))
+        pieces.append(f"<mark>{html.escape(match.group(0))}</mark>")
+        last = match.end()
+    pieces.append(html.escape(window[last:]))
+
+    return ("…" if start > 0 else "") + "".join(pieces) + ("…" if end < len(text) else "")
@@ -0,0 +1,272 @@
+import os
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne, DeleteOne
+from dotenv import load_dotenv
+from app.config.database import get_database
+
+load_dotenv()
+
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", 5))
+
+_buffers: List["WriteBehindBuffer"] = []
+_flush_task: Optional[asyncio.Task] = None
+_stop_flushing: Optional[asyncio.Event] = None
+
+
+class WriteBehindBuffer(ABC):
+    """Base class for in-memory buffers flushed to MongoDB on an interval"""
+
+    def __init__(self):
+        _buffers.append(self)
+
+    @abstractmethod
+    async def flush(self):
+        """Write buffered changes; anything that fails to write stays buffered"""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Buffer metrics for the admin metrics endpoint"""
+
+
+class CounterBuffer(WriteBehindBuffer):
+    """
+    Aggregates per-document counter increments in memory
+
+    Many increments of the same document collapse into one $inc, and all
+    documents are written with a single unordered bulk_write per flush.
+    """
+
+    def __init__(self, collection_name: str, field: str):
+        super().__init__()
+        self.collection_name = collection_name
+        self.field = field
+        self._pending = Counter()
+        self._flushes = 0
+        self._written = 0
+        self._failures = 0
+
+    def increment(self, document_id: str, amount: int = 1):
+        self._pending[document_id] += amount
+
+    def pending(self, document_id: str) -> int:
+        """Increments recorded but not yet written for a document"""
+        return self._pending.get(document_id, 0)
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, Counter()
+        operations = [
+            UpdateOne({"_id": ObjectId(document_id)}, {"$inc": {self.field: amount}})
+            for document_id, amount in pending.items()
+            if ObjectId.is_valid(document_id)
+        ]
+        try:
+            if operations:
+                await get_database()[self.collection_name].bulk_write(operations, ordered=False)
+            self._flushes += 1
+            self._written += len(operations)
+        except Exception as e:
+            # Keep the counts for the next flush instead of dropping them
+            self._pending.update(pending)
+            self._failures += 1
+            print(f"Failed to flush {self.collection_name}.{self.field} counters: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "name": f"{self.collection_name}.{self.field}",
+            "pending_documents": len(self._pending),
+            "pending_increments": sum(self._pending.values()),
+            "flushes": self._flushes,
+            "documents_written": self._written,
+            "failures": self._failures
+        }
+
+
+VOTE_VALUES = {"up": 1, "down": -1, "retract": 0}
+
+
+class VoteBuffer(WriteBehindBuffer):
+    """
+    Per-user question votes, coalesced in memory
+
+    Each user holds at most one vote per question, stored in question_votes
+    under a compact "<question_id>:<user_id>" key. Repeated votes by the same
+    user collapse to their final state, and the question totals are adjusted
+    by the net change only, so voting twice never counts twice.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Dict[str, int] = {}
+        self._flushing: Dict[str, int] = {}
+        self._deltas = Counter()
+        self._flushes = 0
+        self._written = 0
+        self._failures = 0
+
+    @staticmethod
+    def vote_key(question_id: str, user_id: str) -> str:
+        return f"{question_id}:{user_id}"
+
+    async def _current_vote(self, key: str) -> int:
+        if key in self._pending:
+            return self._pending[key]
+        if key in self._flushing:
+            return self._flushing[key]
+        stored = await get_database().question_votes.find_one({"_id": key}, {"vote": 1})
+        # Another request may have voted while the read was in flight
+        if key in self._pending:
+            return self._pending[key]
+        return stored["vote"] if stored else 0
+
+    async def record(self, question_id: str, user_id: str, vote: int) -> int:
+        """
+        Record a user's vote (1, -1 or 0 to retract)
+
+        Returns:
+            The user's previous vote
+        """
+        key = self.vote_key(question_id, user_id)
+        previous = await self._current_vote(key)
+        self._pending[key] = vote
+        self._deltas[(question_id, "upvotes")] += (vote == 1) - (previous == 1)
+        self._deltas[(question_id, "downvotes")] += (vote == -1) - (previous == -1)
+        return previous
+
+    def apply_pending(self, question: dict, question_id: str) -> dict:
+        """Add not yet flushed vote changes to a question's totals"""
+        for field in ("upvotes", "downvotes"):
+            question[field] = question.get(field, 0) + self._deltas.get((question_id, field), 0)
+        return question
+
+    def _total_operations(self, deltas: Counter) -> List[UpdateOne]:
+        increments: Dict[str, Dict[str, int]] = {}
+        for (question_id, field), amount in deltas.items():
+            if amount and ObjectId.is_valid(question_id):
+                increments.setdefault(question_id, {})[field] = amount
+        return [
+            UpdateOne({"_id": ObjectId(question_id)}, {"$inc": inc})
+            for question_id, inc in increments.items()
+        ]
+
+    async def flush(self):
+        if not self._pending and not self._deltas:
+            return
+
+        db = get_database()
+        self._flushing, self._pending = self._pending, {}
+        deltas, self._deltas = self._deltas, Counter()
+
+        now = datetime.utcnow()
+        vote_operations = []
+        for key, vote in self._flushing.items():
+            if vote:
+                question_id, user_id = key.split(":", 1)
+                vote_operations.append(UpdateOne(
+                    {"_id": key},
+                    {
+                        "$set": {"vote": vote, "updated_at": now},
+                        "$setOnInsert": {"question_id": question_id, "user_id": user_id}
+                    },
+                    upsert=True
+                ))
+            else:
+                vote_operations.append(DeleteOne({"_id": key}))
+
+        try:
+            if vote_operations:
+                await db.question_votes.bulk_write(vote_operations, ordered=False)
+        except Exception as e:
+            # Newer votes recorded during the flush win over the failed ones
+            self._pending = {**self._flushing, **self._pending}
+            self._flushing = {}
+            self._deltas.update(deltas)
+            self._failures += 1
+            print(f"Failed to flush question votes: {e}")
+            return
+        self._flushing = {}
+
+        try:
+            total_operations = self._total_operations(deltas)
+            if total_operations:
+                await db.questions.bulk_write(total_operations, ordered=False)
+            self._flushes += 1
+            self._written += len(vote_operations)
+        except Exception as e:
+            # Vote states are stored; only the totals still need writing
+            self._deltas.update(deltas)
+            self._failures += 1
+            print(f"Failed to flush question vote totals: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "name": "question_votes",
+            "pending_documents": len(self._pending),
+            "pending_increments": sum(abs(amount) for amount in self._deltas.values()),
+            "flushes": self._flushes,
+            "documents_written": self._written,
+            "failures": self._failures
+        }
+
+
+paper_views = CounterBuffer("papers", "views")
+question_views = CounterBuffer("questions", "views")
+question_votes = VoteBuffer()
+
+
+async def flush_all():
+    """Flush every write-behind buffer"""
+    for buffer in _buffers:
+        await buffer.flush()
+
+
+def get_write_behind_stats() -> dict:
+    """Buffer statistics for the admin metrics endpoint"""
+    return {
+        "flush_interval_seconds": WRITE_BEHIND_FLUSH_INTERVAL,
+        "buffers": [buffer.stats() for buffer in _buffers]
+    }
+
+
+async def _flush_loop(interval: float, stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await flush_all()
+        except Exception as e:
+            print(f"Write-behind flush error: {e}")
+
+
+def start_write_behind(interval: float = WRITE_BEHIND_FLUSH_INTERVAL):
+    """Start the periodic background flush"""
+    global _flush_task, _stop_flushing
+    if _flush_task is None:
+        _stop_flushing = asyncio.Event()
+        _flush_task = asyncio.create_task(_flush_loop(interval, _stop_flushing))
+
+
+async def stop_write_behind():
+    """
+    Stop the periodic flush and write out everything still buffered
+
+    The loop is signalled and awaited rather than cancelled: a flush has
+    already swapped its buffer out while it awaits the write, so cancelling
+    it mid-flight would drop those counts.
+    """
+    global _flush_task, _stop_flushing
+    if _flush_task is not None:
+        _stop_flushing.set()
+        await _flush_task
+        _flush_task = None
+        _stop_flushing = None
+    await flush_all()
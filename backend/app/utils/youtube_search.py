@@ -1,12 +1,36 @@
 import os
+import asyncio
+import threading
 from typing import List, Dict, Optional
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 from dotenv import load_dotenv
+from app.utils.ttl_cache import TTLCache
 
 load_dotenv()
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
+YOUTUBE_CACHE_SIZE = int(os.getenv("YOUTUBE_CACHE_SIZE", 2048))
+YOUTUBE_CACHE_TTL = int(os.getenv("YOUTUBE_CACHE_TTL", 6 * 60 * 60))  # 6 hours
+YOUTUBE_STATS_TTL = int(os.getenv("YOUTUBE_STATS_TTL", 10 * 60))  # 10 minutes
+YOUTUBE_STATS_BATCH_SIZE = 50  # videos.list accepts at most 50 IDs
+YOUTUBE_STATS_BATCH_WINDOW = 0.05  # Seconds to wait for IDs from concurrent searches
+
+_youtube_client = None
+_client_lock = threading.Lock()
+_thread_local = threading.local()
+
+# Search results keyed on (query, max_results, order, duration)
+_search_cache = TTLCache(maxsize=YOUTUBE_CACHE_SIZE, ttl=YOUTUBE_CACHE_TTL)
+
+# Per-video statistics, and IDs waiting for the next batched videos.list call
+_stats_cache = TTLCache(maxsize=YOUTUBE_CACHE_SIZE * 10, ttl=YOUTUBE_STATS_TTL)
+_pending_stats: Dict[str, asyncio.Future] = {}
+_stats_flush_handle: Optional[asyncio.TimerHandle] = None
+# Batches in flight; the loop only keeps weak references to tasks
+_stats_tasks = set()
+_stats_calls = 0
 
 
 def is_youtube_configured() -> bool:
@@ -14,6 +38,145 @@ def is_youtube_configured() -> bool:
     return bool(YOUTUBE_API_KEY)
 
 
+def get_youtube_client():
+    """Get the shared YouTube API client, building it on first use"""
+    global _youtube_client
+    if _youtube_client is None:
+        with _client_lock:
+            if _youtube_client is None:
+                _youtube_client = build(
+                    'youtube', 'v3',
+                    developerKey=YOUTUBE_API_KEY,
+                    cache_discovery=False,
+                    static_discovery=True
+                )
+    return _youtube_client
+
+
+def _execute_request(request) -> dict:
+    """Execute an API request on a per-thread HTTP connection (httplib2 is not thread-safe)"""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = _thread_local.http = build_http()
+    return request.execute(http=http)
+
+
+async def execute_youtube_request(request) -> dict:
+    """Run a blocking YouTube API request in a worker thread"""
+    return await asyncio.to_thread(_execute_request, request)
+
+
+def get_search_cache_stats() -> dict:
+    """Get hit-rate metrics for the YouTube search and statistics caches"""
+    return {
+        "search": _search_cache.stats(),
+        "statistics": {**_stats_cache.stats(), "api_calls": _stats_calls}
+    }
+
+
+def _parse_statistics(item: dict) -> dict:
+    """Extract the fields we keep from a videos.list item"""
+    stats = item.get('statistics', {})
+    content = item.get('contentDetails', {})
+    return {
+        "view_count": int(stats.get('viewCount', 0)),
+        "like_count": int(stats.get('likeCount', 0)),
+        "comment_count": int(stats.get('commentCount', 0)),
+        "duration": content.get('duration', 'PT0S')
+    }
+
+
+async def _fetch_statistics_batch(batch: Dict[str, asyncio.Future]):
+    """Resolve up to 50 pending futures with one videos.list call"""
+    global _stats_calls
+    try:
+        _stats_calls += 1
+        response = await execute_youtube_request(get_youtube_client().videos().list(
+            part='statistics,contentDetails',
+            id=','.join(batch.keys())
+        ))
+        found = {item['id']: _parse_statistics(item) for item in response.get('items', [])}
+    except Exception as e:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(e)
+        return
+    
+    for video_id, future in batch.items():
+        stats = found.get(video_id)
+        if stats is not None:
+            _stats_cache.set(video_id, stats)
+        if not future.done():
+            future.set_result(stats)
+
+
+def _stats_task_done(task: asyncio.Task):
+    _stats_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"YouTube statistics batch failed: {task.exception()}")
+
+
+def _flush_pending_statistics():
+    """Send every pending ID out in videos.list calls of up to 50 IDs"""
+    global _stats_flush_handle
+    _stats_flush_handle = None
+    
+    pending = list(_pending_stats.items())
+    _pending_stats.clear()
+    for start in range(0, len(pending), YOUTUBE_STATS_BATCH_SIZE):
+        batch = dict(pending[start:start + YOUTUBE_STATS_BATCH_SIZE])
+        task = asyncio.create_task(_fetch_statistics_batch(batch))
+        _stats_tasks.add(task)
+        task.add_done_callback(_stats_task_done)
+
+
+async def get_video_statistics(video_ids: List[str]) -> Dict[str, dict]:
+    """
+    Get statistics for many videos, merging lookups from concurrent callers
+    
+    IDs that are not cached are queued for a short window so that IDs from
+    concurrent searches share videos.list calls of up to 50 IDs.
+    
+    Args:
+        video_ids: YouTube video IDs
+    
+    Returns:
+        dict mapping video_id to its statistics (missing videos are omitted)
+    """
+    global _stats_flush_handle
+    results = {}
+    waiting = {}
+    
+    for video_id in dict.fromkeys(video_ids):
+        stats = _stats_cache.get(video_id)
+        if stats is not None:
+            results[video_id] = stats
+            continue
+        
+        future = _pending_stats.get(video_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            _pending_stats[video_id] = future
+        waiting[video_id] = future
+    
+    if _pending_stats:
+        if len(_pending_stats) >= YOUTUBE_STATS_BATCH_SIZE:
+            if _stats_flush_handle is not None:
+                _stats_flush_handle.cancel()
+            _flush_pending_statistics()
+        elif _stats_flush_handle is None:
+            _stats_flush_handle = asyncio.get_running_loop().call_later(
+                YOUTUBE_STATS_BATCH_WINDOW, _flush_pending_statistics
+            )
+    
+    for video_id, future in waiting.items():
+        stats = await asyncio.shield(future)
+        if stats is not None:
+            results[video_id] = stats
+    
+    return results
+
+
 async def search_youtube_videos(
     query: str,
     max_results: int = 5,
@@ -39,12 +202,17 @@ async def search_youtube_videos(
             "videos": []
         }
     
+    # Identical searches repeat constantly and each costs 100 quota units
+    cache_key = (" ".join(query.lower().split()), max_results, order, video_duration)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+    
     try:
-        # Build YouTube API client
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+        youtube = get_youtube_client()
         
         # Search for videos
-        search_response = youtube.search().list(
+        search_response = await execute_youtube_request(youtube.search().list(
             q=query,
             part='id,snippet',
             maxResults=max_results,
@@ -53,7 +221,7 @@ async def search_youtube_videos(
             videoDuration=video_duration,
             relevanceLanguage='en',
             safeSearch='strict'
-        ).execute()
+        ))
         
         videos = []
         
@@ -75,33 +243,23 @@ async def search_youtube_videos(
             
             videos.append(video_info)
         
-        # Get video statistics (views, likes, etc.)
+        # Get video statistics (views, likes, etc.), joined by video ID
         if videos:
-            video_ids = ','.join([v['video_id'] for v in videos])
-            stats_response = youtube.videos().list(
-                part='statistics,contentDetails',
-                id=video_ids
-            ).execute()
-            
-            # Add statistics to video info
-            for i, stats_item in enumerate(stats_response.get('items', [])):
-                if i < len(videos):
-                    stats = stats_item.get('statistics', {})
-                    content = stats_item.get('contentDetails', {})
-                    
-                    videos[i].update({
-                        "view_count": int(stats.get('viewCount', 0)),
-                        "like_count": int(stats.get('likeCount', 0)),
-                        "comment_count": int(stats.get('commentCount', 0)),
-                        "duration": content.get('duration', 'PT0S')
-                    })
+            statistics = await get_video_statistics([v['video_id'] for v in videos])
+            for video in videos:
+                stats = statistics.get(video['video_id'])
+                if stats:
+                    video.update(stats)
         
-        return {
+        result = {
             "success": True,
             "videos": videos,
             "total_results": len(videos),
             "query": query
         }
+        _search_cache.set(cache_key, result)
+        
+        return {**result, "cached": False}
     
     except HttpError as e:
         return {
@@ -217,12 +375,12 @@ async def get_video_details(video_id: str) -> dict:
         }
     
     try:
-        youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+        youtube = get_youtube_client()
         
-        response = youtube.videos().list(
+        response = await execute_youtube_request(youtube.videos().list(
             part='snippet,statistics,contentDetails',
             id=video_id
-        ).execute()
+        ))
         
         if not response.get('items'):
             return {
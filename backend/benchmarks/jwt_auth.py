@@ -0,0 +1,130 @@
+"""
+Benchmark per-request authentication overhead.
+
+Usage (from the backend directory):
+    python benchmarks/jwt_auth.py [--requests 2000]
+
+Measures:
+  * token verification alone: python-jose decode on every call vs the
+    verified-claims cache in app.utils.jwt
+  * a protected no-op route served in-process: the old dependency chain
+    (sync dependencies, full decode per request) vs the current one
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException, status  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from jose import JWTError, jwt  # noqa: E402
+from app.utils.jwt import (  # noqa: E402
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    decode_access_token,
+    require_role,
+    security,
+)
+
+
+def legacy_verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """The dependency before the claims cache: sync, full decode every time"""
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    return payload
+
+
+def legacy_require_role(allowed_roles: list):
+    def role_checker(token_data: dict = Depends(legacy_verify_token)):
+        if token_data.get("role") not in allowed_roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return token_data
+    return role_checker
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy")
+    async def legacy(user: dict = Depends(legacy_require_role(["student"]))):
+        return {"ok": True}
+
+    @app.get("/cached")
+    async def cached(user: dict = Depends(require_role(["student"]))):
+        return {"ok": True}
+
+    @app.get("/public")
+    async def public():
+        return {"ok": True}
+
+    return app
+
+
+def time_verification(token: str, calls: int):
+    started = time.perf_counter()
+    for _ in range(calls):
+        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    decode = (time.perf_counter() - started) / calls
+
+    decode_access_token(token)  # Warm the cache
+    started = time.perf_counter()
+    for _ in range(calls):
+        decode_access_token(token)
+    cached = (time.perf_counter() - started) / calls
+    return decode, cached
+
+
+async def time_route(client: httpx.AsyncClient, path: str, headers: dict, requests: int, concurrency: int = 32) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path, headers=headers)
+            assert response.status_code == 200, response.text
+
+    await one()  # Warm up
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return (time.perf_counter() - started) / requests
+
+
+async def time_routes(token: str, requests: int):
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        public = await time_route(client, "/public", {}, requests)
+        legacy = await time_route(client, "/legacy", headers, requests)
+        cached = await time_route(client, "/cached", headers, requests)
+    return public, legacy, cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    token = create_access_token({"sub": "bench-user", "role": "student", "username": "bench"})
+
+    decode, cached = time_verification(token, args.requests * 5)
+    print("token verification (per call)")
+    print(f"  python-jose decode   {decode * 1e6:8.1f} us")
+    print(f"  claims cache hit     {cached * 1e6:8.1f} us   ({decode / cached:.0f}x)")
+
+    public, legacy, cached_route = asyncio.run(time_routes(token, args.requests))
+    print("protected no-op route (per request, in-process)")
+    print(f"  no auth              {public * 1e6:8.1f} us")
+    print(f"  legacy dependencies  {legacy * 1e6:8.1f} us   (+{(legacy - public) * 1e6:.1f} us auth)")
+    print(f"  cached dependencies  {cached_route * 1e6:8.1f} us   (+{(cached_route - public) * 1e6:.1f} us auth)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark login throughput and event-loop responsiveness during a login wave.
+
+Usage (from the backend directory):
+    python benchmarks/login_throughput.py [--logins 32]
+
+Serves two in-process login routes that verify a real bcrypt hash (same
+CryptContext as auth_controller, no database): one verifies inline on the
+event loop as before, one through the bounded password executor. While the
+wave runs, a /ping request is sent every 10 ms; the longest gap between
+answered pings shows how long other requests are frozen. A final burst
+above the queue limit shows how many logins are shed with 503.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from app.controllers.auth_controller import hash_password, verify_password  # noqa: E402
+from app.utils import password_hashing  # noqa: E402
+from app.utils.password_hashing import PasswordHashingBusy, run_password_work  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/inline")
+    async def inline():
+        if not verify_password(PASSWORD, hashed):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/pooled")
+    async def pooled():
+        try:
+            valid = await run_password_work(verify_password, PASSWORD, hashed)
+        except PasswordHashingBusy as e:
+            raise HTTPException(status_code=503, headers={"Retry-After": str(e.retry_after)})
+        if not valid:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def login_wave(client: httpx.AsyncClient, path: str, logins: int):
+    answered = []
+    done = asyncio.Event()
+
+    async def pinger():
+        while not done.is_set():
+            await client.get("/ping")
+            answered.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    pinger_task = asyncio.create_task(pinger())
+    responses = await asyncio.gather(*(client.post(path) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await pinger_task
+
+    statuses = [r.status_code for r in responses]
+    marks = [started] + [t for t in answered if t <= started + elapsed] + [started + elapsed]
+    return elapsed, statuses, [b - a for a, b in zip(marks, marks[1:])]
+
+
+def report(name: str, elapsed: float, statuses: list, gaps: list):
+    ok = statuses.count(200)
+    shed = statuses.count(503)
+    gaps_ms = sorted(gap * 1000 for gap in gaps)
+    print(
+        f"{name:<10}{ok:>6}{shed:>6}{elapsed:>10.2f}{ok / elapsed:>12.1f}"
+        f"{len(gaps) - 1:>7}{statistics.median(gaps_ms):>12.1f}{gaps_ms[-1]:>12.1f}"
+    )
+
+
+async def run(logins: int):
+    hashed = hash_password(PASSWORD)
+    transport = httpx.ASGITransport(app=build_app(hashed))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"workers={password_hashing.PASSWORD_HASH_WORKERS} logins={logins}")
+        print(f"{'route':<10}{'ok':>6}{'503':>6}{'seconds':>10}{'logins/s':>12}{'pings':>7}{'p50 gap ms':>12}{'max gap ms':>12}")
+        report("inline", *await login_wave(client, "/inline", logins))
+
+        # Queue limit above the wave size: nothing is shed
+        password_hashing.PASSWORD_HASH_MAX_PENDING = logins
+        report("pooled", *await login_wave(client, "/pooled", logins))
+
+        # Burst four times the queue limit
+        password_hashing.PASSWORD_HASH_MAX_PENDING = max(1, logins // 4)
+        report("burst", *await login_wave(client, "/pooled", logins))
+    password_hashing.shutdown_password_executor()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins))
+
+
+if __name__ == "__main__":
+    main()
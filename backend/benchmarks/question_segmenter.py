@@ -0,0 +1,111 @@
+"""
+Benchmark the single-pass question segmenter against the old regex cascade.
+
+Usage (from the backend directory):
+    python benchmarks/question_segmenter.py [--repeat 5]
+
+The corpus is generated deterministically to mimic large OCR dumps:
+Q-style, "Question N" and numbered papers, plus marker-free text where
+the old cascade rescanned the whole dump once per pattern.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.utils.ocr_extractor import parse_questions_from_text  # noqa: E402
+
+WORDS = (
+    "explain define derive compare network protocol layer routing packet "
+    "algorithm complexity graph tree process thread memory paging deadlock "
+    "schema query index transaction normalization circuit voltage current "
+    "the of and with for in a an its using between"
+).split()
+
+
+def legacy_parse_questions_from_text(text: str) -> List[Dict]:
+    """The regex cascade that parse_questions_from_text replaced"""
+    questions = []
+    patterns = [
+        r'Q\.?\s*(\d+)[\.\):]?\s*(.*?)(?=Q\.?\s*\d+|$)',
+        r'Question\s*(\d+)[\.\):]?\s*(.*?)(?=Question\s*\d+|$)',
+        r'(\d+)[\.\)]\s+(.*?)(?=\d+[\.\)]|$)',
+    ]
+    for pattern in patterns:
+        for match in re.finditer(pattern, text, re.IGNORECASE | re.DOTALL):
+            question_text = match.group(2).strip()
+            if len(question_text) < 10:
+                continue
+            question_text = re.sub(r'\s+', ' ', question_text)[:5000]
+            marks_match = re.search(r'\[(\d+)\s*marks?\]|\((\d+)\s*marks?\)', question_text, re.IGNORECASE)
+            marks = int(marks_match.group(1) or marks_match.group(2)) if marks_match else None
+            questions.append({"question_number": int(match.group(1)), "question_text": question_text, "marks": marks})
+        if questions:
+            break
+    questions.sort(key=lambda x: x['question_number'])
+    seen = set()
+    return [q for q in questions if not (q['question_number'] in seen or seen.add(q['question_number']))]
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def build_corpus(seed: int = 42) -> Dict[str, str]:
+    rng = random.Random(seed)
+    q_style = "\n".join(
+        f"Q{i}. {sentence(rng, 60)} [{rng.randint(2, 15)} marks]\n{sentence(rng, 40)}"
+        for i in range(1, 301)
+    )
+    question_style = "\n".join(
+        f"Question {i}: {sentence(rng, 60)} [{rng.randint(2, 15)} marks]\n{sentence(rng, 40)}"
+        for i in range(1, 301)
+    )
+    numbered = "\n".join(
+        f"{i}. {sentence(rng, 60)} ({rng.randint(2, 15)} marks)\n{sentence(rng, 40)}"
+        for i in range(1, 301)
+    )
+    marker_free = "\n".join(
+        f"{sentence(rng, 20)} page {rng.randint(1, 99)} {sentence(rng, 20)}"
+        for _ in range(1500)
+    )
+    return {
+        "q_style": q_style,
+        "question_style": question_style,
+        "numbered": numbered,
+        "marker_free": marker_free
+    }
+
+
+def time_call(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'corpus':<16}{'size':>10}{'questions':>11}{'legacy ms':>12}{'single ms':>12}{'speed-up':>10}")
+    for name, text in build_corpus().items():
+        found = len(parse_questions_from_text(text))
+        legacy = time_call(legacy_parse_questions_from_text, text, args.repeat)
+        single = time_call(parse_questions_from_text, text, args.repeat)
+        print(
+            f"{name:<16}{len(text):>10}{found:>11}"
+            f"{legacy * 1000:>12.2f}{single * 1000:>12.2f}{legacy / single:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark response encoding and compression for the large list endpoints.
+
+Usage (from the backend directory):
+    python benchmarks/serialization.py [--repeat 5] [--rows 100]
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with the
+orjson-based FastJSONResponse, and reports bytes on the wire with no
+compression, gzip and brotli (when installed). Payloads are generated to
+match what the controllers return: full and summary question lists with
+long markdown AI solutions, and paper lists.
+"""
+import argparse
+import gzip
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bson import ObjectId  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from app.utils.serialization import FastJSONResponse  # noqa: E402
+from app.utils.compression import brotli  # noqa: E402
+
+WORDS = (
+    "explain define derive compare network protocol layer routing packet "
+    "algorithm complexity graph tree process thread memory paging deadlock "
+    "schema query index transaction normalization circuit voltage current "
+    "the of and with for in a an its using between"
+).split()
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def solution_markdown(rng: random.Random) -> str:
+    sections = []
+    for heading in ("Understanding the question", "Key concepts", "Step-by-step solution", "Final answer"):
+        sections.append(f"## {heading}\n\n" + "\n".join(f"- {sentence(rng, 25)}" for _ in range(6)))
+    return "\n\n".join(sections)
+
+
+def build_payloads(rows: int, seed: int = 7) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    paper_id = str(ObjectId())
+
+    full_questions = []
+    for i in range(1, rows + 1):
+        full_questions.append({
+            "id": str(ObjectId()),
+            "question_number": i,
+            "question_text": sentence(rng, 60),
+            "paper_id": paper_id,
+            "subject": "Computer Networks",
+            "marks": rng.randint(2, 15),
+            "source": "ocr",
+            "faculty_solution": None,
+            "ai_solution": {"text": solution_markdown(rng), "generated_at": now, "model": "gemini-pro"},
+            "has_ai_solution": True,
+            "video_links": [
+                {
+                    "title": sentence(rng, 8),
+                    "url": f"https://www.youtube.com/watch?v={ObjectId()}",
+                    "thumbnail": f"https://i.ytimg.com/vi/{ObjectId()}/mqdefault.jpg",
+                    "channel": sentence(rng, 2),
+                    "views": rng.randint(100, 10 ** 6),
+                }
+                for _ in range(5)
+            ],
+            "has_video_solution": True,
+            "tags": ["networking", "osi"],
+            "upvotes": rng.randint(0, 50),
+            "downvotes": rng.randint(0, 5),
+            "views": rng.randint(0, 5000),
+            "created_at": now - timedelta(minutes=i),
+        })
+
+    summary_questions = [
+        {
+            "id": q["id"],
+            "question_number": q["question_number"],
+            "question_text": q["question_text"][:300],
+            "text_truncated": len(q["question_text"]) > 300,
+            "paper_id": q["paper_id"],
+            "subject": q["subject"],
+            "marks": q["marks"],
+            "has_ai_solution": True,
+            "has_video_solution": True,
+            "tags": q["tags"],
+            "upvotes": q["upvotes"],
+            "downvotes": q["downvotes"],
+            "views": q["views"],
+        }
+        for q in full_questions
+    ]
+
+    papers = [
+        {
+            "id": str(ObjectId()),
+            "subject": sentence(rng, 3).title(),
+            "college": "ABC College",
+            "course": "B.Tech CSE",
+            "semester": rng.randint(1, 8),
+            "year": rng.randint(2015, 2024),
+            "exam_type": rng.choice(["Midterm", "Endterm", "Quiz"]),
+            "pdf_url": f"/uploads/papers/{ObjectId()}.pdf",
+            "faculty_name": "Dr. Smith",
+            "has_faculty_solution": rng.random() < 0.3,
+            "question_count": rng.randint(5, 40),
+            "views": rng.randint(0, 10000),
+            "created_at": now - timedelta(hours=i),
+        }
+        for i in range(rows)
+    ]
+
+    return {
+        "questions (full)": {"success": True, "questions": full_questions, "total": rows},
+        "questions (summary)": {"success": True, "questions": summary_questions, "total": rows},
+        "papers": {"success": True, "papers": papers, "total": rows * 10, "next_cursor": None},
+    }
+
+
+def default_encode(payload: dict) -> bytes:
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+
+def fast_encode(payload: dict) -> bytes:
+    return FastJSONResponse(content=payload).body
+
+
+def time_call(fn: Callable, payload, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'payload':<22}{'default ms':>12}{'orjson ms':>11}{'speed-up':>10}{'raw KB':>10}{'gzip KB':>10}{'br KB':>9}")
+    for name, payload in build_payloads(args.rows).items():
+        default = time_call(default_encode, payload, args.repeat)
+        fast = time_call(fast_encode, payload, args.repeat)
+        body = fast_encode(payload)
+        gzipped = len(gzip.compress(body, compresslevel=6))
+        brotlied = f"{len(brotli.compress(body, quality=4)) / 1024:>9.1f}" if brotli else f"{'n/a':>9}"
+        print(
+            f"{name:<22}{default * 1000:>12.2f}{fast * 1000:>11.2f}{default / fast:>9.1f}x"
+            f"{len(body) / 1024:>10.1f}{gzipped / 1024:>10.1f}{brotlied}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,14 +31,17 @@ const QuestionCard = ({ question, paperSubject }) => {
     setShowAIModal(true);
 
     try {
-      const response = await questionAPI.generateAISolution(question.id);
-      if (response.data.success) {
-        setAiSolution(response.data.ai_solution);
-      } else {
-        setError(response.data.message || 'Failed to generate AI solution');
-      }
+      // Stream the answer so text shows up as soon as the first chunk arrives
+      await questionAPI.streamAISolution(question.id, {
+        chunk: ({ text }) => {
+          setLoadingAI(false);
+          setAiSolution((prev) => ({ ...prev, text: (prev?.text || '') + text }));
+        },
+        done: ({ ai_solution }) => setAiSolution(ai_solution),
+        error: ({ message }) => setError(message || 'Failed to generate AI solution'),
+      });
     } catch (err) {
-      setError(err.response?.data?.detail || 'Failed to generate AI solution. Please try again.');
+      setError(err.message || 'Failed to generate AI solution. Please try again.');
       console.error('AI generation error:', err);
     } finally {
       setLoadingAI(false);
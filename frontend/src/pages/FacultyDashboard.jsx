@@ -56,7 +56,7 @@ const FacultyDashboard = () => {
       setMessage('Uploading and processing...');
       const res = await paperAPI.uploadPDF(fd);
       if (res.data.success) {
-        setMessage('Upload successful. Questions extracted.');
+        setMessage('Upload successful. Questions are being extracted.');
         setFile(null);
         setForm((f) => ({ ...f, subject: '' }));
         await loadDashboard();
@@ -6,18 +6,25 @@ import { Link } from 'react-router-dom';
 const SavedItems = () => {
   const [papers, setPapers] = useState([]);
   const [questions, setQuestions] = useState([]);
+  const [counts, setCounts] = useState({ papers: 0, questions: 0 });
+  const [papersCursor, setPapersCursor] = useState(null);
+  const [questionsCursor, setQuestionsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     const load = async () => {
       try {
         setLoading(true);
-        const [pRes, qRes] = await Promise.all([
+        const [pRes, qRes, cRes] = await Promise.all([
           userAPI.getSavedPapers(),
           userAPI.getSavedQuestions(),
+          userAPI.getSavedCounts(),
         ]);
         setPapers(pRes.data || []);
+        setPapersCursor(pRes.headers['x-next-cursor'] || null);
         setQuestions(qRes.data || []);
+        setQuestionsCursor(qRes.headers['x-next-cursor'] || null);
+        setCounts({ papers: cRes.data?.papers || 0, questions: cRes.data?.questions || 0 });
       } catch (e) {
         console.error('Failed to load saved items', e);
       } finally {
@@ -27,6 +34,26 @@ const SavedItems = () => {
     load();
   }, []);
 
+  const loadMorePapers = async () => {
+    try {
+      const res = await userAPI.getSavedPapers(papersCursor);
+      setPapers((prev) => [...prev, ...(res.data || [])]);
+      setPapersCursor(res.headers['x-next-cursor'] || null);
+    } catch (e) {
+      console.error('Failed to load more saved papers', e);
+    }
+  };
+
+  const loadMoreQuestions = async () => {
+    try {
+      const res = await userAPI.getSavedQuestions(questionsCursor);
+      setQuestions((prev) => [...prev, ...(res.data || [])]);
+      setQuestionsCursor(res.headers['x-next-cursor'] || null);
+    } catch (e) {
+      console.error('Failed to load more saved questions', e);
+    }
+  };
+
   return (
     <div className="min-h-screen py-10">
       <div className="container-brutal">
@@ -45,7 +72,7 @@ const SavedItems = () => {
           <div className="grid grid-cols-1 lg:grid-cols-2 gap-8">
             {/* Saved Papers */}
             <div>
-              <h2 className="text-2xl font-bold uppercase mb-4">Papers ({papers.length})</h2>
+              <h2 className="text-2xl font-bold uppercase mb-4">Papers ({counts.papers})</h2>
               {papers.length === 0 ? (
                 <Card className="text-center py-10">
                   <p className="font-bold">No saved papers yet</p>
@@ -68,13 +95,16 @@ const SavedItems = () => {
                       <Link to={`/papers/${paper.id}`} className="btn btn-secondary">Open</Link>
                     </Card>
                   ))}
+                  {papersCursor && (
+                    <Button variant="outline" onClick={loadMorePapers}>Load More</Button>
+                  )}
                 </div>
               )}
             </div>
 
             {/* Saved Questions */}
             <div>
-              <h2 className="text-2xl font-bold uppercase mb-4">Questions ({questions.length})</h2>
+              <h2 className="text-2xl font-bold uppercase mb-4">Questions ({counts.questions})</h2>
               {questions.length === 0 ? (
                 <Card className="text-center py-10">
                   <p className="font-bold">No saved questions yet</p>
@@ -92,6 +122,9 @@ const SavedItems = () => {
                       </div>
                     </Card>
                   ))}
+                  {questionsCursor && (
+                    <Button variant="outline" onClick={loadMoreQuestions}>Load More</Button>
+                  )}
                 </div>
               )}
             </div>
@@ -28,17 +28,16 @@ export const StudentDashboard = () => {
   const fetchDashboardData = async () => {
     try {
       // Fetch recent papers and stats
-      const [papersRes, savedPapersRes, savedQuestionsRes] = await Promise.all([
+      const [papersRes, savedCountsRes] = await Promise.all([
         paperAPI.getAll({ college: user.college, limit: 6 }),
-        userAPI.getSavedPapers(),
-        userAPI.getSavedQuestions(),
+        userAPI.getSavedCounts(),
       ]);
       
       setRecentPapers(papersRes.data.papers || []);
       setStats({
         totalPapers: papersRes.data.total || 0,
         solved: 0, // TODO: wire to actual tracking when available
-        saved: (savedPapersRes.data?.length || 0) + (savedQuestionsRes.data?.length || 0),
+        saved: (savedCountsRes.data?.papers || 0) + (savedCountsRes.data?.questions || 0),
       });
     } catch (error) {
       console.error('Failed to fetch dashboard data:', error);
@@ -57,11 +57,46 @@ export const paperAPI = {
   }),
 };
 
+// POST to a Server-Sent Events endpoint and dispatch each event to handlers[event](data)
+const streamEvents = async (path, handlers) => {
+  const savedAuth = localStorage.getItem('examverse-auth');
+  const token = savedAuth ? JSON.parse(savedAuth).token : null;
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+  });
+  if (!response.ok) {
+    const body = await response.json().catch(() => ({}));
+    throw new Error(body.detail || `Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const data = raw.match(/^data: (.*)$/m)?.[1];
+      if (event && data && handlers[event]) handlers[event](JSON.parse(data));
+    }
+  }
+};
+
 // Question APIs
 export const questionAPI = {
-  getByPaper: (paperId) => api.get(`/questions/paper/${paperId}`),
+  // Full question text, without solution payloads (fetched per question on demand)
+  getByPaper: (paperId) => api.get(`/questions/paper/${paperId}`, {
+    params: { fields: 'question_number,question_text,marks,has_ai_solution,has_video_solution,upvotes,downvotes,views' },
+  }),
   getById: (id) => api.get(`/questions/${id}`),
   generateAISolution: (questionId) => api.post(`/questions/${questionId}/ai-solution`),
+  streamAISolution: (questionId, handlers) => streamEvents(`/questions/${questionId}/ai-solution/stream`, handlers),
   getVideoSolutions: (questionId, refresh = false) => 
     api.get(`/questions/${questionId}/videos`, { params: { refresh } }),
   reportIssue: (questionId, data) => api.post(`/questions/${questionId}/report`, data),
@@ -72,8 +107,10 @@ export const questionAPI = {
 export const userAPI = {
   getProfile: () => api.get('/user/profile'),
   updateProfile: (data) => api.put('/user/profile', data),
-  getSavedPapers: () => api.get('/user/saved/papers'),
-  getSavedQuestions: () => api.get('/user/saved/questions'),
+  // Pages are newest first; pass the previous response's x-next-cursor header to get the next one
+  getSavedPapers: (cursor) => api.get('/user/saved/papers', { params: { cursor } }),
+  getSavedQuestions: (cursor) => api.get('/user/saved/questions', { params: { cursor } }),
+  getSavedCounts: () => api.get('/user/saved/counts'),
   savePaper: (paperId) => api.post(`/user/saved/papers/${paperId}`),
   saveQuestion: (questionId) => api.post(`/user/saved/questions/${questionId}`),
   unsavePaper: (paperId) => api.delete(`/user/saved/papers/${paperId}`),